@@ -1,18 +1,16 @@
 import argparse
+import multiprocessing as mp
 import os
-import re
 import textwrap
-from collections import Counter
-from typing import List
 
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-from utils.io_functions import ensure_outdir, write_markdown, savefig
+from utils.io_functions import ensure_outdir, read_csv, write_csv, write_markdown, savefig
 from utils.eda_functions import clean_colnames, is_nonempty_str, get_present_columns
-from utils.text_mining_functions import word_tokenize, remove_stopwords, top_n, bigrams, parse_skills_cell, summarize_text_lengths
+from utils.text_mining_functions import count_tokens_and_bigrams, sum_counts, top_n, parse_skills_cell, summarize_text_lengths
 from utils.visuzalization_functions import save_barplot
 
 # ---------------------------
@@ -20,7 +18,7 @@ from utils.visuzalization_functions import save_barplot
 # ---------------------------
 
 # stopword list
-STOPWORDS = {
+STOPWORDS = frozenset({
     "a","an","and","are","as","at","be","by","for","from","has","he","in","is","it","its",
     "of","on","that","the","to","was","were","will","with","this","these","those","or",
     "we","you","your","their","they","them","our","us","i","me","my","mine","hers","his",
@@ -30,7 +28,7 @@ STOPWORDS = {
     "down","again","further","once","because","until","while","both","each","few","more",
     "most","other","some","such","only","own","same","too","very","s","t","just","don",
     "now"
-}
+})
 
 DEFAULT_TEXT_COLUMNS_CANDIDATES = [
     "course_title",
@@ -47,15 +45,38 @@ RANDOM_STATE = 42
 # EDA pipeline
 # ---------------------------
 
-def eda_courses(input_csv: str, outdir: str, show: bool = False) -> None:
+def _count_tokens(texts: pd.Series):
+    # Top-level so it can be pickled into worker processes
+    return count_tokens_and_bigrams(texts, STOPWORDS, min_len=2)
+
+
+def count_tokens_parallel(texts: pd.Series, workers: int):
+    # Shard rows across processes; bigrams never span rows, so per-shard counts add up exactly
+    if workers <= 0:
+        workers = mp.cpu_count()
+    workers = max(1, min(workers, len(texts)))
+    if workers == 1:
+        results = [_count_tokens(texts)]
+    else:
+        bounds = np.linspace(0, len(texts), workers + 1).astype(int)
+        shards = [texts.iloc[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+        with mp.Pool(workers) as pool:
+            results = list(pool.imap(_count_tokens, shards))
+    return sum_counts(r[0] for r in results), sum_counts(r[1] for r in results)
+
+
+def eda_courses(input_csv: str, outdir: str, show: bool = False, workers: int = 1) -> None:
     sns.set_style(PLOT_STYLE)
     np.random.seed(RANDOM_STATE)
 
     ensure_outdir(outdir)
     report_lines = []
 
+    # One figure is reused (cleared) for every bar plot and histogram below
+    fig, ax = plt.subplots(figsize=(10, 6))
+
     # Load dataset
-    df = pd.read_csv(input_csv, engine="python", encoding="utf-8", on_bad_lines="skip")
+    df = read_csv(input_csv)
     orig_shape = df.shape
     df = clean_colnames(df)
 
@@ -74,16 +95,16 @@ def eda_courses(input_csv: str, outdir: str, show: bool = False) -> None:
     mv = miss.reset_index()
     mv.columns = ["column", "missing_count"]
     mv["missing_pct"] = (mv["missing_count"] / len(df) * 100).round(2)
-    mv.to_csv(os.path.join(outdir, "missing_values.csv"), index=False)
+    write_csv(mv, os.path.join(outdir, "missing_values.csv"))
 
     if len(mv):
-        plt.figure(figsize=(10, 6))
-        sns.barplot(data=mv, x="column", y="missing_count", color="#d62728")
-        plt.title("Missing Values by Column")
-        plt.xticks(rotation=45, ha="right")
-        plt.ylabel("Missing Count")
-        plt.xlabel("Column")
-        savefig(os.path.join(outdir, "missing_values.png"))
+        ax.clear()
+        sns.barplot(data=mv, x="column", y="missing_count", color="#d62728", ax=ax)
+        ax.set_title("Missing Values by Column")
+        plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+        ax.set_ylabel("Missing Count")
+        ax.set_xlabel("Column")
+        savefig(os.path.join(outdir, "missing_values.png"), fig=fig, close=False)
         report_lines.append("## Missing values")
         report_lines.append("")
         report_lines.append("See: missing_values.csv and missing_values.png")
@@ -117,7 +138,7 @@ def eda_courses(input_csv: str, outdir: str, show: bool = False) -> None:
         if c == "extracted_skills":
             continue
         desc_df = summarize_text_lengths(df[c])
-        desc_df.to_csv(os.path.join(outdir, f"{c}_lengths.csv"), index=False)
+        write_csv(desc_df, os.path.join(outdir, f"{c}_lengths.csv"))
 
         # Histograms
         for col, title_part in [
@@ -125,12 +146,12 @@ def eda_courses(input_csv: str, outdir: str, show: bool = False) -> None:
             ("word_count", "Word Count"),
             ("sentence_count", "Sentence Count"),
         ]:
-            plt.figure(figsize=(10, 6))
-            sns.histplot(desc_df[col], kde=True, bins=40, color="#1f77b4")
-            plt.title(f"{title_part} Distribution for {c}")
-            plt.xlabel(title_part)
-            plt.ylabel("Frequency")
-            savefig(os.path.join(outdir, f"{c}_{col}_hist.png"))
+            ax.clear()
+            sns.histplot(desc_df[col], kde=True, bins=40, color="#1f77b4", ax=ax)
+            ax.set_title(f"{title_part} Distribution for {c}")
+            ax.set_xlabel(title_part)
+            ax.set_ylabel("Frequency")
+            savefig(os.path.join(outdir, f"{c}_{col}_hist.png"), dpi=100, fig=fig, close=False)
 
     report_lines.append("## Text length outputs")
     report_lines.append("Generated CSVs and histograms for detected text columns (character length, word count, sentence count).")
@@ -145,37 +166,26 @@ def eda_courses(input_csv: str, outdir: str, show: bool = False) -> None:
 
     if preferred_desc is not None:
         report_lines.append(f"## Token analysis on: {preferred_desc}")
-        texts = df[preferred_desc].fillna("").astype(str).tolist()
-        tokens_all: List[str] = []
-        for t in texts:
-            toks = word_tokenize(t, min_len=2)
-            toks = remove_stopwords(toks, STOPWORDS)
-            tokens_all.extend(toks)
-
-        token_counts = Counter(tokens_all)
+        token_counts, bigram_counts = count_tokens_parallel(df[preferred_desc], workers)
         token_df = pd.DataFrame(top_n(token_counts, 100), columns=["token", "count"])
-        token_df.to_csv(os.path.join(outdir, "top_tokens.csv"), index=False)
+        write_csv(token_df, os.path.join(outdir, "top_tokens.csv"))
         if len(token_df):
             save_barplot(
                 token_df, x="token", y="count",
                 title=f"Top Tokens in {preferred_desc}",
                 outfile=os.path.join(outdir, "top_tokens.png"),
-                top_n=30, rotate=65
+                top_n=30, rotate=65, ax=ax
             )
 
         # Bigrams
-        bigram_counter = Counter()
-        for t in texts:
-            toks = remove_stopwords(word_tokenize(t, min_len=2), STOPWORDS)
-            bigram_counter.update([" ".join(bg) for bg in bigrams(toks)])
-        bigram_df = pd.DataFrame(top_n(bigram_counter, 100), columns=["bigram", "count"])
-        bigram_df.to_csv(os.path.join(outdir, "top_bigrams.csv"), index=False)
+        bigram_df = pd.DataFrame(top_n(bigram_counts, 100), columns=["bigram", "count"])
+        write_csv(bigram_df, os.path.join(outdir, "top_bigrams.csv"))
         if len(bigram_df):
             save_barplot(
                 bigram_df, x="bigram", y="count",
                 title=f"Top Bigrams in {preferred_desc}",
                 outfile=os.path.join(outdir, "top_bigrams.png"),
-                top_n=30, rotate=65
+                top_n=30, rotate=65, ax=ax
             )
         report_lines.append("- Generated token and bigram frequency plots and CSVs.")
         report_lines.append("")
@@ -187,26 +197,19 @@ def eda_courses(input_csv: str, outdir: str, show: bool = False) -> None:
     # Extracted skills analysis
     if "extracted_skills" in df.columns:
         report_lines.append("## Extracted skills analysis")
-        all_skills: List[str] = []
-        for cell in df["extracted_skills"]:
-            skills = parse_skills_cell(cell)
-            # Normalize skills
-            norm = []
-            for s in skills:
-                s_clean = re.sub(r"\s+", " ", s).strip().lower()
-                if s_clean:
-                    norm.append(s_clean)
-            all_skills.extend(norm)
-
-        skill_counts = Counter(all_skills)
-        if skill_counts:
-            skills_df = pd.DataFrame(skill_counts.most_common(100), columns=["skill", "count"])
-            skills_df.to_csv(os.path.join(outdir, "top_skills.csv"), index=False)
+        # One vectorized normalization pass over all parsed skills
+        skills = df["extracted_skills"].map(parse_skills_cell).explode().dropna()
+        norm = skills.str.replace(r"\s+", " ", regex=True).str.strip().str.lower()
+        norm = norm[norm.str.len() > 0]
+        skill_counts = norm.value_counts(sort=False)
+        if len(skill_counts):
+            skills_df = pd.DataFrame(top_n(skill_counts, 100), columns=["skill", "count"])
+            write_csv(skills_df, os.path.join(outdir, "top_skills.csv"))
             save_barplot(
                 skills_df, x="skill", y="count",
                 title="Top Extracted Skills",
                 outfile=os.path.join(outdir, "top_skills.png"),
-                top_n=30, rotate=65
+                top_n=30, rotate=65, ax=ax
             )
             report_lines.append("- Generated top skills CSV and bar plot.")
         else:
@@ -217,15 +220,22 @@ def eda_courses(input_csv: str, outdir: str, show: bool = False) -> None:
         report_lines.append("- Column 'extracted_skills' not found.")
         report_lines.append("")
 
+    plt.close(fig)
+
     # Basic per-column cardinality and sample values
     report_lines.append("## Cardinality and sample values")
     card_rows = []
+    # Hash each string column once into a categorical; its categories are exactly the non-null uniques
+    cats = {c: df[c].astype("category") for c in df.select_dtypes(include=["object", "string"]).columns}
     for c in df.columns:
-        nunique = int(df[c].nunique(dropna=True))
+        if c in cats:
+            nunique = len(cats[c].cat.categories)
+        else:
+            nunique = int(df[c].nunique(dropna=True))
         sample_vals = [repr(x) for x in df[c].dropna().astype(str).head(3).tolist()]
         card_rows.append((c, nunique, "; ".join(sample_vals)))
     card_df = pd.DataFrame(card_rows, columns=["column", "unique_values", "sample_values"])
-    card_df.to_csv(os.path.join(outdir, "cardinality_samples.csv"), index=False)
+    write_csv(card_df, os.path.join(outdir, "cardinality_samples.csv"))
     report_lines.append("- See cardinality_samples.csv")
     report_lines.append("")
 
@@ -233,7 +243,7 @@ def eda_courses(input_csv: str, outdir: str, show: bool = False) -> None:
     numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
     if numeric_cols:
         desc = df[numeric_cols].describe().T
-        desc.to_csv(os.path.join(outdir, "numeric_summary.csv"))
+        write_csv(desc, os.path.join(outdir, "numeric_summary.csv"), index=True)
         plt.figure(figsize=(10, 6))
         sns.heatmap(df[numeric_cols].corr(numeric_only=True), annot=True, fmt=".2f", cmap="coolwarm", square=False)
         plt.title("Correlation Heatmap (Numeric Columns)")
@@ -260,9 +270,10 @@ def main():
     parser.add_argument("--input", "-i", type=str, default="courses_dataset.csv", help="Path to the input CSV file")
     parser.add_argument("--outdir", "-o", type=str, default="eda_output", help="Directory to store outputs")
     parser.add_argument("--show", action="store_true", help="Print report to console after finishing")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="Processes for token/bigram counting (0 = all CPUs)")
     args = parser.parse_args()
 
-    eda_courses(input_csv=args.input, outdir=args.outdir, show=args.show)
+    eda_courses(input_csv=args.input, outdir=args.outdir, show=args.show, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -2,9 +2,12 @@ from typing import Iterable, List
 import re
 import pandas as pd
 
+_WS_RE = re.compile(r"\s+")
+
+
 def clean_colnames(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = [re.sub(r"\s+", "_", c.strip().lower()) for c in df.columns]
+    # Renames columns in place (no copy of the data); returns the same frame for chaining
+    df.columns = [_WS_RE.sub("_", c.strip().lower()) for c in df.columns]
     return df
 
 
@@ -3,18 +3,54 @@
 # ----------------------------------------
 
 import os
+import matplotlib
+matplotlib.use("Agg")  # non-interactive backend: plots are only written to files
 import matplotlib.pyplot as plt
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+plt.ioff()
 
 
 def ensure_outdir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def savefig(path: str, tight: bool = True) -> None:
+def read_csv(path: str) -> pd.DataFrame:
+    # Prefer Arrow's multithreaded parser; fall back to pandas' C engine
+    if PYARROW_AVAILABLE:
+        table = pacsv.read_csv(
+            path,
+            parse_options=pacsv.ParseOptions(newlines_in_values=True, invalid_row_handler=lambda row: "skip"),
+            convert_options=pacsv.ConvertOptions(strings_can_be_null=True),
+        )
+        return table.to_pandas()
+    return pd.read_csv(path, engine="c", encoding="utf-8", on_bad_lines="skip")
+
+
+def write_csv(df: pd.DataFrame, path: str, index: bool = False) -> None:
+    # Arrow's C writer when available; frames with an index to keep go through pandas (blank index header)
+    if PYARROW_AVAILABLE and not index:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pacsv.write_csv(table, path, write_options=pacsv.WriteOptions(quoting_style="needed"))
+        return
+    df.to_csv(path, index=index)
+
+
+def savefig(path: str, tight: bool = True, dpi: int = 150, fig=None, close: bool = True) -> None:
+    # Pass close=False to keep a shared figure alive for the next plot
+    fig = fig if fig is not None else plt.gcf()
     if tight:
-        plt.tight_layout()
-    plt.savefig(path, dpi=150)
-    plt.close()
+        fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+    if close:
+        plt.close(fig)
 
 
 def write_markdown(path: str, content: str) -> None:
@@ -4,30 +4,68 @@
 
 import re
 import ast
-from typing import Iterable, List, Tuple
+import json
+from typing import AbstractSet, Iterable, List, Tuple, Union
 from collections import Counter
 import pandas as pd
 
+_TOKEN_RE = re.compile(r"[^a-zA-Z]+")
+# Unicode whitespace spelled out (as str.isspace sees it) so Arrow-backed strings count the same as Python's re
+_WS_CHARS = "\t-\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+_WORD_RE = re.compile("[^" + _WS_CHARS + "]+")
+# A sentence is a run between terminators that holds at least one non-space character
+_SENT_RE = re.compile("[^.!?" + _WS_CHARS + "][^.!?]*")
+_SKILL_SPLIT_RE = re.compile(r"[;,]")
+
 
 def word_tokenize(text: str, min_len: int = 2) -> List[str]:
     # Split on non-letters, lowercase, filter length
-    tokens = re.split(r"[^a-zA-Z]+", text.lower())
+    tokens = _TOKEN_RE.split(text.lower())
     return [t for t in tokens if len(t) >= min_len]
 
 
-def remove_stopwords(tokens: Iterable[str], stopwords: Iterable[str]) -> List[str]:
-    sw = set(stopwords)
-    return [t for t in tokens if t not in sw]
+def tokenize_series(series: pd.Series, stopwords: Iterable[str], min_len: int = 2) -> pd.Series:
+    # Vectorized word_tokenize + remove_stopwords; one token per row, original row index kept
+    pattern = re.compile(r"[a-z]{%d,}" % min_len)
+    tokens = series.fillna("").astype(str).str.lower().str.findall(pattern).explode().dropna()
+    return tokens[~tokens.isin(stopwords)]
+
+
+def remove_stopwords(tokens: Iterable[str], stopwords: AbstractSet[str]) -> List[str]:
+    # stopwords must already be a set/frozenset; it is not rebuilt per call
+    assert isinstance(stopwords, (set, frozenset)), "stopwords must be a set or frozenset"
+    return [t for t in tokens if t not in stopwords]
 
 
-def top_n(counter: Counter, n: int) -> List[Tuple[str, int]]:
-    return counter.most_common(n)
+def top_n(counts: Union[Counter, pd.Series], n: int) -> List[Tuple[str, int]]:
+    if isinstance(counts, Counter):
+        return counts.most_common(n)
+    # Series of counts: partial selection instead of a full sort; ties keep first-seen order
+    top = counts.nlargest(n, keep="first")
+    return list(zip(top.index, top.to_numpy()))
 
 
 def bigrams(tokens: List[str]) -> List[Tuple[str, str]]:
     return [(tokens[i], tokens[i+1]) for i in range(len(tokens)-1)]
 
 
+def bigram_series(tokens: pd.Series) -> pd.Series:
+    # Vectorized bigrams over the output of tokenize_series; pairs never cross row boundaries
+    following = tokens.groupby(level=0).shift(-1)
+    return (tokens + " " + following).dropna()
+
+
+def count_tokens_and_bigrams(series: pd.Series, stopwords: Iterable[str], min_len: int = 2) -> Tuple[pd.Series, pd.Series]:
+    # Unsorted counts in first-seen order
+    tokens = tokenize_series(series, stopwords, min_len=min_len)
+    return tokens.value_counts(sort=False), bigram_series(tokens).value_counts(sort=False)
+
+
+def sum_counts(counts: Iterable[pd.Series]) -> pd.Series:
+    # Merge per-shard value_counts, keeping first-seen order (unsorted; select with top_n)
+    return pd.concat(list(counts)).groupby(level=0, sort=False).sum()
+
+
 def parse_skills_cell(cell) -> List[str]:
     if cell is None or (isinstance(cell, float) and pd.isna(cell)):
         return []
@@ -38,19 +76,31 @@ def parse_skills_cell(cell) -> List[str]:
         return []
     # Try literal eval for list-like content
     if (s.startswith("[") and s.endswith("]")) or (s.startswith("(") and s.endswith(")")):
-        try:
-            parsed = ast.literal_eval(s)
-            if isinstance(parsed, (list, tuple)):
-                return [str(x).strip() for x in parsed if str(x).strip()]
-        except Exception:
-            pass
+        parsed = None
+        # Fast path: a list of plain single-quoted strings (no escapes or double quotes) is valid JSON
+        # once the quotes are swapped; anything else goes through literal_eval as before
+        if s.startswith("[") and '"' not in s and "\\" not in s:
+            try:
+                parsed = json.loads(s.replace("'", '"'))
+            except ValueError:
+                parsed = None
+            if not (isinstance(parsed, list) and all(isinstance(x, str) for x in parsed)):
+                parsed = None
+        if parsed is None:
+            try:
+                parsed = ast.literal_eval(s)
+            except Exception:
+                parsed = None
+        if isinstance(parsed, (list, tuple)):
+            return [str(x).strip() for x in parsed if str(x).strip()]
     # Fallback: split by common delimiters
-    parts = re.split(r"[;,]", s)
+    parts = _SKILL_SPLIT_RE.split(s)
     return [p.strip() for p in parts if p.strip()]
 
 
 def summarize_text_lengths(series: pd.Series) -> pd.DataFrame:
-    lens = series.fillna("").astype(str).map(len)
-    words = series.fillna("").astype(str).map(lambda s: len([t for t in re.split(r"\s+", s.strip()) if t]))
-    sents = series.fillna("").astype(str).map(lambda s: len([x for x in re.split(r"[.!?]+", s) if x.strip()]))
+    s = series.fillna("").astype(str)
+    lens = s.str.len()
+    words = s.str.count(_WORD_RE)
+    sents = s.str.count(_SENT_RE)
     return pd.DataFrame({"char_len": lens, "word_count": words, "sentence_count": sents})
\ No newline at end of file
@@ -6,14 +6,19 @@ import seaborn as sns
 
 from utils.io_functions import savefig
 
-def save_barplot(counts_df: pd.DataFrame, x: str, y: str, title: str, outfile: str, top_n: Optional[int] = None, rotate: int = 45):
+def save_barplot(counts_df: pd.DataFrame, x: str, y: str, title: str, outfile: str, top_n: Optional[int] = None, rotate: int = 45, ax=None):
+    # With an ax the plot is drawn on that reused Axes (cleared first) and its figure is left open
     df = counts_df.copy()
     if top_n is not None and len(df) > top_n:
         df = df.iloc[:top_n]
-    plt.figure(figsize=(10, 6))
-    sns.barplot(data=df, x=x, y=y, color="#1f77b4")
-    plt.title(title)
-    plt.xticks(rotation=rotate, ha="right")
-    plt.xlabel(x.replace("_", " ").title())
-    plt.ylabel(y.replace("_", " ").title())
-    savefig(outfile)
\ No newline at end of file
+    close = ax is None
+    if ax is None:
+        _, ax = plt.subplots(figsize=(10, 6))
+    else:
+        ax.clear()
+    sns.barplot(data=df, x=x, y=y, color="#1f77b4", ax=ax)
+    ax.set_title(title)
+    plt.setp(ax.get_xticklabels(), rotation=rotate, ha="right")
+    ax.set_xlabel(x.replace("_", " ").title())
+    ax.set_ylabel(y.replace("_", " ").title())
+    savefig(outfile, fig=ax.figure, close=close)
\ No newline at end of file
@@ -0,0 +1,11 @@
+"""Shared handling of apoc.periodic.iterate results for the graph builders."""
+
+
+def iterate_errors(record) -> str:
+    """Return the batch errors reported in an apoc.periodic.iterate result row ('' if every batch succeeded).
+
+    APOC does not raise when an inner batch fails; it only counts it in failedBatches.
+    """
+    if record is None or not record["failedBatches"]:
+        return ""
+    return "; ".join(record["errorMessages"]) or f"{record['failedBatches']} failed batches"
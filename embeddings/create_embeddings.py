@@ -1,7 +1,10 @@
 import argparse
 import os
+import queue
 import sys
-from typing import List, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -14,9 +17,55 @@ try:
 except Exception:
     TORCH_AVAILABLE = False
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 from sentence_transformers import SentenceTransformer
 
 
+# Bytes Arrow parses per streaming block; blocks are regrouped into chunks of --chunksize rows
+CSV_BLOCK_BYTES = 1 << 24
+
+
+def open_arrow_csv(path: str, column_types: Optional[dict] = None) -> "pacsv.CSVStreamingReader":
+    return pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True, invalid_row_handler=lambda row: "skip"),
+        convert_options=pacsv.ConvertOptions(strings_can_be_null=True, column_types=column_types or {}),
+    )
+
+
+def iter_csv_chunks(path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    # Arrow streams the file block by block, so only about one chunk of rows is resident at a time
+    if PYARROW_AVAILABLE:
+        # Types are inferred from the first block; a column that is empty there would be typed null
+        # and reject later values, so such columns are read as strings
+        with open_arrow_csv(path) as probe:
+            null_columns = {f.name: pa.string() for f in probe.schema if pa.types.is_null(f.type)}
+        start, pending = 0, None
+        with open_arrow_csv(path, null_columns) as reader:
+            for batch in reader:
+                block = pa.Table.from_batches([batch])
+                pending = block if pending is None else pa.concat_tables([pending, block])
+                while pending.num_rows >= chunksize:
+                    chunk = pending.slice(0, chunksize).to_pandas()
+                    chunk.index = pd.RangeIndex(start, start + len(chunk))
+                    start += len(chunk)
+                    pending = pending.slice(chunksize)
+                    yield chunk
+        if pending is not None and pending.num_rows:
+            chunk = pending.to_pandas()
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            yield chunk
+        return
+    yield from pd.read_csv(path, engine="c", encoding="utf-8", on_bad_lines="skip", chunksize=chunksize)
+
+
 def detect_text_columns(df: pd.DataFrame) -> List[str]:
     # Prefer common text-like columns first if present
     preferred = [
@@ -34,68 +83,112 @@ def detect_text_columns(df: pd.DataFrame) -> List[str]:
     return ordered
 
 
-def build_row_text(row: pd.Series, cols: List[str], sep: str = " | ") -> str:
-    parts = []
+def build_row_texts(df: pd.DataFrame, cols: List[str], sep: str = " | ") -> pd.Series:
+    # "col: value" parts joined per row, skipping missing/blank cells; NaN where a row has no parts
+    combined = None
     for c in cols:
-        val = row.get(c, "")
-        if pd.isna(val):
-            continue
-        s = str(val).strip()
-        if s:
-            parts.append(f"{c}: {s}")
-    return sep.join(parts)
+        vals = df[c].astype(str).str.strip()
+        part = (f"{c}: " + vals).where(df[c].notna() & (vals.str.len() > 0))
+        combined = part if combined is None else (combined + sep + part).fillna(combined).fillna(part)
+    return combined
 
 
-def trim_text(s: str, max_chars: Optional[int]) -> str:
+def trim_texts(texts: pd.Series, max_chars: Optional[int]) -> pd.Series:
     if max_chars is None or max_chars <= 0:
-        return s
-    if len(s) <= max_chars:
-        return s
-    return s[:max_chars]
+        return texts
+    return texts.str.slice(0, max_chars)
+
+
+def apply_precision(model: SentenceTransformer, device: str, precision: str) -> SentenceTransformer:
+    # auto: FP16 on CUDA, FP32 on CPU. int8 (dynamic quantization of Linear layers) is CPU-only and opt-in
+    if precision == "auto":
+        precision = "fp16" if device == "cuda" else "fp32"
+    if precision == "fp16":
+        if device != "cuda":
+            print("WARNING: fp16 needs a CUDA device; keeping fp32.", file=sys.stderr)
+            return model
+        return model.half()
+    if precision == "int8":
+        if device != "cpu":
+            print("WARNING: int8 quantization runs on CPU only; keeping fp32.", file=sys.stderr)
+            return model
+        import torch
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
 
 
 def encode_texts(texts: List[str],
                  model: SentenceTransformer,
                  batch_size: int,
-                 normalize: bool) -> np.ndarray:
-    embeddings = model.encode(
-        texts,
-        batch_size=batch_size,
-        convert_to_numpy=True,
-        normalize_embeddings=normalize,
-        show_progress_bar=True
-    )
-    return embeddings
+                 normalize: bool,
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
+    # Batches are written straight into `out` (e.g. a memmap), so no second full-size copy is made
+    if out is None:
+        out = np.empty((len(texts), model.get_sentence_embedding_dimension()), dtype=np.float32)
 
+    # Group similar lengths into the same batch so padding stays small; rows land at their input position
+    order = np.argsort([len(t) for t in texts], kind="stable")
+    starts = range(0, len(texts), batch_size)
 
-def main():
-    parser = argparse.ArgumentParser(description="Create embeddings for a CSV using all-MiniLM-L6-v2.")
-    parser.add_argument("--input", "-i", type=str, required=True, help="Path to input CSV file.")
-    parser.add_argument("--output-prefix", "-o", type=str, required=True, help="Output file prefix (without extension).")
-    parser.add_argument("--columns", type=str, default="", help="Comma-separated column names to use as text fields. If omitted, auto-detects text columns.")
-    parser.add_argument("--mode", type=str, choices=["row", "cell"], default="row", help="Embedding mode: 'row' or 'cell'.")
-    parser.add_argument("--batch-size", type=int, default=64, help="Batch size for embedding.")
-    parser.add_argument("--normalize", action="store_true", help="L2-normalize embeddings.")
-    parser.add_argument("--max-chars", type=int, default=0, help="Trim each text to at most this many characters (0 = no trim).")
-    parser.add_argument("--sample", type=int, default=0, help="For quick testing: only embed the first N items (0 = all).")
-    args = parser.parse_args()
+    # A background thread gathers the next batches while the model encodes the current one
+    batches: "queue.Queue" = queue.Queue(maxsize=4)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for start in starts:
+                idx = order[start:start + batch_size]
+                item = (idx, [texts[i] for i in idx])
+                while not stop.is_set():
+                    try:
+                        batches.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+        finally:
+            # Sentinel; always delivered so the consumer never waits forever
+            while not stop.is_set():
+                try:
+                    batches.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        producer = executor.submit(produce)
+        try:
+            with tqdm(total=len(starts), desc="Encoding") as pbar:
+                while True:
+                    item = batches.get()
+                    if item is None:
+                        break
+                    idx, batch = item
+                    out[idx] = model.encode(
+                        batch,
+                        batch_size=batch_size,
+                        convert_to_numpy=True,
+                        normalize_embeddings=normalize,
+                        show_progress_bar=False
+                    )
+                    pbar.update(1)
+        finally:
+            stop.set()
+        producer.result()
+    return out
 
-    if not os.path.exists(args.input):
-        print(f"ERROR: Input file not found: {args.input}", file=sys.stderr)
-        sys.exit(1)
 
-    # Load CSV
-    df = pd.read_csv(args.input, engine="python", encoding="utf-8", on_bad_lines="skip")
-    # Keep original column names for metadata; also build a lowercase mapping for detection
-    lower_cols = {c: c for c in df.columns}  # identity mapping
-    # For detection, create a normalized copy with lowercase colnames
-    df_norm = df.copy()
-    df_norm.columns = [c.strip().lower() for c in df_norm.columns]
+def select_columns(df: pd.DataFrame, columns: str) -> List[str]:
+    # Case-insensitive lookup of original names; the first column wins on collisions
+    lower_to_orig = {}
+    for c in df.columns:
+        lower_to_orig.setdefault(c.strip().lower(), c)
 
     # Determine columns to use
-    if args.columns.strip():
+    if columns.strip():
         # Respect user-provided columns; match case-insensitively
-        requested = [c.strip() for c in args.columns.split(",") if c.strip()]
+        requested = [c.strip() for c in columns.split(",") if c.strip()]
         selected_cols = []
         for rc in requested:
             # Try exact
@@ -103,75 +196,98 @@ def main():
                 selected_cols.append(rc)
                 continue
             # Try lowercase match
-            rc_lower = rc.lower()
-            matches = [orig for orig in df.columns if orig.lower() == rc_lower]
-            if matches:
-                selected_cols.append(matches[0])
+            match = lower_to_orig.get(rc.lower())
+            if match is not None:
+                selected_cols.append(match)
             else:
                 print(f"WARNING: Column '{rc}' not found. Skipping.", file=sys.stderr)
         if not selected_cols:
             print("ERROR: No valid columns found from --columns.", file=sys.stderr)
             sys.exit(1)
     else:
-        # Auto-detect from normalized df, but map back to original names
+        # Detection only needs names and dtypes, so run it on an empty, renamed slice instead of a copy
+        df_norm = df.iloc[:0].set_axis([c.strip().lower() for c in df.columns], axis=1)
         detected_lower = detect_text_columns(df_norm)
-        # Map detected lowercased names back to original names by case-insensitive match
-        selected_cols = []
-        for lc in detected_lower:
-            matches = [orig for orig in df.columns if orig.lower() == lc]
-            if matches:
-                selected_cols.append(matches[0])
+        # Map detected lowercased names back to original names
+        selected_cols = [lower_to_orig[lc] for lc in detected_lower if lc in lower_to_orig]
         if not selected_cols:
             # Fallback: use all columns as text
             selected_cols = df.columns.tolist()
             print("INFO: No text-like columns detected; using all columns.", file=sys.stderr)
 
-    print(f"Using columns: {selected_cols}", file=sys.stderr)
-    print(f"Mode: {args.mode}", file=sys.stderr)
+    return selected_cols
 
-    # Initialize model and device
-    device = "cpu"
-    if TORCH_AVAILABLE:
-        try:
-            import torch
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-        except Exception:
-            device = "cpu"
-    print(f"Loading model on device: {device}", file=sys.stderr)
-    model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2", device=device)
 
+def prepare_texts(df: pd.DataFrame,
+                  cols: List[str],
+                  mode: str,
+                  max_chars: Optional[int]) -> Tuple[List[str], List[dict]]:
     texts: List[str] = []
     meta_rows: List[dict] = []
 
-    if args.mode == "row":
-        for idx, row in tqdm(df.iterrows(), total=len(df), desc="Preparing row texts"):
-            txt = build_row_text(row, selected_cols)
-            txt = trim_text(txt, args.max_chars)
-            if txt.strip():
-                texts.append(txt)
-                meta_rows.append({
-                    "source": "row",
-                    "row_index": int(idx),
-                    "text": txt
-                })
-    elif args.mode == "cell":
-        for idx, row in tqdm(df.iterrows(), total=len(df), desc="Preparing cell texts"):
-            for c in selected_cols:
-                val = row.get(c, "")
-                if pd.isna(val):
-                    continue
-                txt = str(val).strip()
-                if not txt:
-                    continue
-                txt = trim_text(txt, args.max_chars)
-                if txt:
-                    texts.append(txt)
-                    meta_rows.append({
-                        "source": "cell",
-                        "row_index": int(idx),
-                        "column": c,
-                        "text": txt
-                    })
+    if mode == "row":
+        row_texts = trim_texts(build_row_texts(df, cols), max_chars).dropna()
+        row_texts = row_texts[row_texts.str.strip().str.len() > 0]
+        texts = row_texts.tolist()
+        meta_rows = [
+            {"source": "row", "row_index": int(idx), "text": txt}
+            for idx, txt in zip(row_texts.index, texts)
+        ]
+    elif mode == "cell":
+        pieces = []
+        for pos, c in enumerate(cols):
+            vals = df[c].dropna().astype(str).str.strip()
+            vals = trim_texts(vals[vals.str.len() > 0], max_chars)
+            pieces.append(pd.DataFrame({"row_index": vals.index, "col_pos": pos, "column": c, "text": vals.to_numpy()}))
+        # Restore row-major order: every kept cell of a row, in column order
+        cells = pd.concat(pieces).sort_values(["row_index", "col_pos"], kind="stable")
+        texts = cells["text"].tolist()
+        meta_rows = [
+            {"source": "cell", "row_index": int(idx), "column": c, "text": txt}
+            for idx, c, txt in zip(cells["row_index"], cells["column"], texts)
+        ]
+
+    return texts, meta_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create embeddings for a CSV using all-MiniLM-L6-v2.")
+    parser.add_argument("--input", "-i", type=str, required=True, help="Path to input CSV file.")
+    parser.add_argument("--output-prefix", "-o", type=str, required=True, help="Output file prefix (without extension).")
+    parser.add_argument("--columns", type=str, default="", help="Comma-separated column names to use as text fields. If omitted, auto-detects text columns.")
+    parser.add_argument("--mode", type=str, choices=["row", "cell"], default="row", help="Embedding mode: 'row' or 'cell'.")
+    parser.add_argument("--batch-size", type=int, default=64, help="Batch size for embedding.")
+    parser.add_argument("--normalize", action="store_true", help="L2-normalize embeddings.")
+    parser.add_argument("--precision", type=str, choices=["auto", "fp32", "fp16", "int8"], default="auto", help="Model precision: 'auto' (fp16 on CUDA, fp32 on CPU), 'fp32', 'fp16' (CUDA) or 'int8' (CPU dynamic quantization).")
+    parser.add_argument("--max-chars", type=int, default=0, help="Trim each text to at most this many characters (0 = no trim).")
+    parser.add_argument("--chunksize", type=int, default=200_000, help="Number of CSV rows to read per chunk.")
+    parser.add_argument("--sample", type=int, default=0, help="For quick testing: only embed the first N items (0 = all).")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"ERROR: Input file not found: {args.input}", file=sys.stderr)
+        sys.exit(1)
+
+    # Stream the CSV in chunks so only one chunk of raw rows is resident at a time
+    reader = iter_csv_chunks(args.input, args.chunksize)
+
+    texts: List[str] = []
+    meta_rows: List[dict] = []
+    selected_cols: Optional[List[str]] = None
+
+    for chunk in reader:
+        # Resolve columns once, from the first chunk
+        if selected_cols is None:
+            selected_cols = select_columns(chunk, args.columns)
+            print(f"Using columns: {selected_cols}", file=sys.stderr)
+            print(f"Mode: {args.mode}", file=sys.stderr)
+
+        chunk_texts, chunk_meta = prepare_texts(chunk, selected_cols, args.mode, args.max_chars)
+        texts.extend(chunk_texts)
+        meta_rows.extend(chunk_meta)
+
+        if args.sample and len(texts) >= args.sample:
+            break
 
     if args.sample and args.sample > 0:
         texts = texts[: args.sample]
@@ -182,15 +298,37 @@ def main():
         print("ERROR: No non-empty texts prepared for embedding.", file=sys.stderr)
         sys.exit(1)
 
-    # Encode
-    embeddings = encode_texts(texts, model, batch_size=args.batch_size, normalize=args.normalize)
-    assert embeddings.shape[0] == len(texts), "Embedding count mismatch."
+    # Initialize model and device
+    device = "cpu"
+    if TORCH_AVAILABLE:
+        try:
+            import torch
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        except Exception:
+            device = "cpu"
+    print(f"Loading model on device: {device}", file=sys.stderr)
+    model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2", device=device)
+    model = apply_precision(model, device, args.precision)
 
-    # Save outputs
     out_emb = f"{args.output_prefix}_embeddings.npy"
     out_meta = f"{args.output_prefix}_metadata.csv"
 
-    np.save(out_emb, embeddings)
+    # Encode into a memory-mapped .npy so the full array never has to sit in RAM twice
+    dim = model.get_sentence_embedding_dimension()
+    embeddings = np.lib.format.open_memmap(out_emb, mode="w+", dtype=np.float32, shape=(len(texts), dim))
+
+    # Encode each distinct text once, then scatter back to the original order
+    codes, unique_texts = pd.factorize(pd.Series(texts, dtype=object))
+    print(f"Encoding {len(unique_texts)} unique texts ({len(texts)} total).", file=sys.stderr)
+    if len(unique_texts) == len(texts):
+        # No duplicates: codes are the identity, write directly into the output file
+        encode_texts(texts, model, batch_size=args.batch_size, normalize=args.normalize, out=embeddings)
+    else:
+        unique_embeddings = encode_texts(unique_texts.tolist(), model, batch_size=args.batch_size, normalize=args.normalize)
+        for start in range(0, len(texts), args.chunksize):
+            embeddings[start:start + args.chunksize] = unique_embeddings[codes[start:start + args.chunksize]]
+    embeddings.flush()
+
     pd.DataFrame(meta_rows).to_csv(out_meta, index=False)
 
     print(f"Saved embeddings: {out_emb}  shape={embeddings.shape}", file=sys.stderr)
@@ -65,7 +65,6 @@ python create_neo4j_enisa_graph.py \
     --user "$NEO4J_USER" \
     --password "$NEO4J_PASSWORD" \
     --clear \
-    --batch-size 100 \
     --skill-similarity-threshold 2 \
     --knowledge-similarity-threshold 2
 
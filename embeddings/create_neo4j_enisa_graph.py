@@ -17,208 +17,313 @@ This script:
 """
 
 import argparse
+import csv
 import os
+import re
 import sys
-from typing import List, Dict, Set
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Set, Tuple
 
-import pandas as pd
-from tqdm import tqdm
+from apoc_results import iterate_errors
 
 try:
     from neo4j import GraphDatabase
+    from neo4j.exceptions import TransientError
     NEO4J_AVAILABLE = True
 except ImportError:
     NEO4J_AVAILABLE = False
     print("WARNING: neo4j package not installed. Install with: pip install neo4j", file=sys.stderr)
 
+# Attempts for the auto-commit similarity queries on transient errors
+SIMILARITY_RETRIES = 3
+
+# Batch errors from apoc.periodic.iterate worth rerunning the whole call for (deadlocks, lock timeouts)
+_TRANSIENT_BATCH_ERRORS = ("deadlock", "transienterror", "lockclient")
+
+# Records per pull from the server; keeps protocol messages bounded for large writes/reads
+FETCH_SIZE = 1000
+
+# Node labels only this script writes (removed by --clear). Skill nodes are shared with the course
+# graph (same skill_name_unique constraint), so --clear only removes those no Course links to.
+ENISA_LABELS = ['Profile', 'Knowledge', 'Deliverable']
+
+# Leading whitespace and bullet markers (•, ○, *, -) stripped from each item
+_BULLET_RE = re.compile(r'^[\s\u2022\u25cb*\-]+')
+
 
 class EnisaGraphBuilder:
     """Build a Neo4j graph from ENISA cybersecurity profiles dataset."""
     
-    def __init__(self, uri: str, user: str, password: str):
+    def __init__(self, uri: str, user: str, password: str, batch_size: int = 10_000):
         """Initialize Neo4j connection."""
         if not NEO4J_AVAILABLE:
             raise ImportError("neo4j package is required. Install with: pip install neo4j")
         
         self.driver = GraphDatabase.driver(uri, auth=(user, password))
+        # Upper bound on rows per UNWIND; smaller lists go in a single query
+        self.batch_size = batch_size
+        # One session shared by every method instead of a new session per call
+        self._session = self.driver.session(fetch_size=FETCH_SIZE)
         
     def close(self):
-        """Close the Neo4j connection."""
+        """Close the Neo4j session and connection."""
+        if self._session:
+            self._session.close()
         if self.driver:
             self.driver.close()
     
+    def _write(self, query: str, params: Dict = None, session=None) -> None:
+        """Run a write query in a managed (retried) transaction."""
+        session = session or self._session
+        session.execute_write(lambda tx: tx.run(query, params or {}).consume())
+    
+    def _delete_nodes(self, match: str, what: str) -> None:
+        """DETACH DELETE the nodes n found by match (a MATCH ... clause) in bounded transactions."""
+        session = self._session
+        try:
+            # Neo4j 4.4+: batched inner transactions (auto-commit query only)
+            session.run(f"{match} CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF 10000 ROWS").consume()
+        except Exception as e:
+            try:
+                record = session.run(
+                    "CALL apoc.periodic.iterate($outer, 'DETACH DELETE n', {batchSize: 10000})",
+                    outer=f"{match} RETURN n"
+                ).single()
+            except Exception:
+                raise e  # The fallback is unavailable too (e.g. no APOC): report the original error
+            errors = iterate_errors(record)
+            if errors:
+                raise RuntimeError(f"Deleting {what} failed: {errors}")
+    
     def clear_database(self):
-        """Clear all nodes and relationships from the database."""
-        with self.driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
-            print("Database cleared.", file=sys.stderr)
+        """Delete the ENISA graph in bounded transactions, keeping the Skill nodes the course graph uses."""
+        # Deleting profiles also removes their HAS_SKILL edges and the integrator's profile-course links
+        for label in ENISA_LABELS:
+            self._delete_nodes(f"MATCH (n:{label})", f"{label} nodes")
+        self._delete_nodes("MATCH (n:Skill) WHERE NOT (n)<-[:HAS_SKILL]-(:Course)", "ENISA-only Skill nodes")
+        # Shared skills stay; their profile counts are stale until the import sets them again
+        self._write("MATCH (n:Skill) WHERE n.profile_count IS NOT NULL REMOVE n.profile_count")
+        print("Database cleared.", file=sys.stderr)
     
     def create_constraints(self):
         """Create constraints and indexes for better performance."""
-        with self.driver.session() as session:
-            # Create uniqueness constraints
-            constraints = [
-                "CREATE CONSTRAINT profile_title_unique IF NOT EXISTS FOR (p:Profile) REQUIRE p.title IS UNIQUE",
-                "CREATE CONSTRAINT skill_name_unique IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE",
-                "CREATE CONSTRAINT knowledge_name_unique IF NOT EXISTS FOR (k:Knowledge) REQUIRE k.name IS UNIQUE",
-                "CREATE CONSTRAINT deliverable_name_unique IF NOT EXISTS FOR (d:Deliverable) REQUIRE d.name IS UNIQUE",
-            ]
-            
-            for constraint in constraints:
-                try:
-                    session.run(constraint)
-                except Exception as e:
-                    print(f"Note: Could not create constraint: {e}", file=sys.stderr)
-            
-            # Create indexes
-            indexes = [
-                "CREATE INDEX profile_no_idx IF NOT EXISTS FOR (p:Profile) ON (p.profile_no)",
-                "CREATE INDEX skill_name_idx IF NOT EXISTS FOR (s:Skill) ON (s.name)",
-                "CREATE INDEX knowledge_name_idx IF NOT EXISTS FOR (k:Knowledge) ON (k.name)",
-            ]
-            
-            for index in indexes:
-                try:
-                    session.run(index)
-                except Exception as e:
-                    print(f"Note: Could not create index: {e}", file=sys.stderr)
+        # Schema statements run as auto-commit queries on the shared session
+        session = self._session
+        # Create uniqueness constraints
+        constraints = [
+            "CREATE CONSTRAINT profile_title_unique IF NOT EXISTS FOR (p:Profile) REQUIRE p.title IS UNIQUE",
+            "CREATE CONSTRAINT skill_name_unique IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE",
+            "CREATE CONSTRAINT knowledge_name_unique IF NOT EXISTS FOR (k:Knowledge) REQUIRE k.name IS UNIQUE",
+            "CREATE CONSTRAINT deliverable_name_unique IF NOT EXISTS FOR (d:Deliverable) REQUIRE d.name IS UNIQUE",
+        ]
+        
+        for constraint in constraints:
+            try:
+                session.run(constraint).consume()
+            except Exception as e:
+                print(f"Note: Could not create constraint: {e}", file=sys.stderr)
+        
+        # Create indexes
+        indexes = [
+            "CREATE INDEX profile_no_idx IF NOT EXISTS FOR (p:Profile) ON (p.profile_no)",
+            "CREATE INDEX skill_name_idx IF NOT EXISTS FOR (s:Skill) ON (s.name)",
+            "CREATE INDEX knowledge_name_idx IF NOT EXISTS FOR (k:Knowledge) ON (k.name)",
+            "CREATE INDEX skill_profile_count_idx IF NOT EXISTS FOR (s:Skill) ON (s.profile_count)",
+            "CREATE INDEX knowledge_profile_count_idx IF NOT EXISTS FOR (k:Knowledge) ON (k.profile_count)",
+        ]
+        
+        for index in indexes:
+            try:
+                session.run(index).consume()
+            except Exception as e:
+                print(f"Note: Could not create index: {e}", file=sys.stderr)
+    
+    def run_concurrently(self, *calls) -> None:
+        """Run (method, *args) tuples in parallel threads, each with its own session.
+
+        Sessions are not thread-safe, so every call gets a fresh one from the (thread-safe) driver;
+        managed transactions retry if concurrent writes on shared Profile nodes deadlock.
+        """
+        def run(method, *args):
+            with self.driver.session(fetch_size=FETCH_SIZE) as session:
+                method(*args, session=session)
+        
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            futures = [executor.submit(run, *call) for call in calls]
+            for future in futures:
+                future.result()
     
-    def batch_create_profiles(self, profiles: List[Dict]) -> None:
-        """Create multiple profile nodes in a single transaction."""
-        with self.driver.session() as session:
-            query = """
-            UNWIND $profiles AS profile
-            CREATE (p:Profile {
-                profile_no: profile.profile_no,
-                title: profile.title,
-                mission: profile.mission,
-                main_tasks: profile.main_tasks
-            })
-            """
-            session.run(query, profiles=profiles)
+    def _run_batched(self, query: str, columns: Dict[str, List], session=None) -> None:
+        """Run an UNWIND query over equal-length parameter lists, one transaction per batch_size chunk."""
+        n = len(next(iter(columns.values())))
+        for i in range(0, n, self.batch_size):
+            self._write(query, {k: v[i:i + self.batch_size] for k, v in columns.items()}, session)
     
-    def batch_create_skills(self, skills: List[str]) -> None:
-        """Create multiple skill nodes in a single transaction."""
-        with self.driver.session() as session:
-            query = """
-            UNWIND $skills AS skill
-            MERGE (s:Skill {name: skill})
-            """
-            session.run(query, skills=list(skills))
+    def batch_create_profiles(self, profiles: List[List], session=None) -> None:
+        """Create multiple profile nodes from [profile_no, title, mission, main_tasks] rows."""
+        query = """
+        UNWIND $profiles AS row
+        CREATE (p:Profile {
+            profile_no: row[0],
+            title: row[1],
+            mission: row[2],
+            main_tasks: row[3]
+        })
+        """
+        self._run_batched(query, {"profiles": profiles}, session)
     
-    def batch_create_knowledge(self, knowledge_items: List[str]) -> None:
-        """Create multiple knowledge nodes in a single transaction."""
-        with self.driver.session() as session:
-            query = """
-            UNWIND $knowledge_items AS knowledge
-            MERGE (k:Knowledge {name: knowledge})
-            """
-            session.run(query, knowledge_items=list(knowledge_items))
+    def get_profile_element_ids(self, session=None) -> Dict[str, str]:
+        """Map each profile title to its elementId, so relationships can match profiles without an index probe per row."""
+        session = session or self._session
+        return session.execute_read(
+            lambda tx: {r["title"]: r["id"] for r in tx.run("MATCH (p:Profile) RETURN p.title AS title, elementId(p) AS id")}
+        )
     
-    def batch_create_deliverables(self, deliverables: List[str]) -> None:
-        """Create multiple deliverable nodes in a single transaction."""
-        with self.driver.session() as session:
-            query = """
-            UNWIND $deliverables AS deliverable
-            MERGE (d:Deliverable {name: deliverable})
-            """
-            session.run(query, deliverables=list(deliverables))
+    def batch_create_profile_skill_relationships(self, profile_ids: List[str], skills: List[str], session=None) -> None:
+        """Create Skill nodes on first use and the profile-skill relationships from parallel profile elementId/name lists."""
+        query = """
+        UNWIND range(0, size($profile_ids) - 1) AS i
+        MERGE (s:Skill {name: $skills[i]})
+        ON CREATE SET s.name_lc = toLower(s.name)
+        WITH i, s
+        MATCH (p) WHERE elementId(p) = $profile_ids[i]
+        CREATE (p)-[:HAS_SKILL]->(s)
+        """
+        self._run_batched(query, {"profile_ids": profile_ids, "skills": skills}, session)
     
-    def batch_create_profile_skill_relationships(self, relationships: List[Dict]) -> None:
-        """Create multiple profile-skill relationships in a single transaction."""
-        with self.driver.session() as session:
-            query = """
-            UNWIND $relationships AS rel
-            MATCH (p:Profile {title: rel.profile_title})
-            MATCH (s:Skill {name: rel.skill})
-            CREATE (p)-[:HAS_SKILL]->(s)
-            """
-            session.run(query, relationships=relationships)
+    def batch_create_profile_knowledge_relationships(self, profile_ids: List[str], knowledge: List[str], session=None) -> None:
+        """Create Knowledge nodes on first use and the profile-knowledge relationships from parallel profile elementId/name lists."""
+        query = """
+        UNWIND range(0, size($profile_ids) - 1) AS i
+        MERGE (k:Knowledge {name: $knowledge[i]})
+        ON CREATE SET k.name_lc = toLower(k.name)
+        WITH i, k
+        MATCH (p) WHERE elementId(p) = $profile_ids[i]
+        CREATE (p)-[:REQUIRES_KNOWLEDGE]->(k)
+        """
+        self._run_batched(query, {"profile_ids": profile_ids, "knowledge": knowledge}, session)
     
-    def batch_create_profile_knowledge_relationships(self, relationships: List[Dict]) -> None:
-        """Create multiple profile-knowledge relationships in a single transaction."""
-        with self.driver.session() as session:
-            query = """
-            UNWIND $relationships AS rel
-            MATCH (p:Profile {title: rel.profile_title})
-            MATCH (k:Knowledge {name: rel.knowledge})
-            CREATE (p)-[:REQUIRES_KNOWLEDGE]->(k)
-            """
-            session.run(query, relationships=relationships)
+    def batch_create_profile_deliverable_relationships(self, profile_ids: List[str], deliverables: List[str], session=None) -> None:
+        """Create Deliverable nodes on first use and the profile-deliverable relationships from parallel profile elementId/name lists."""
+        query = """
+        UNWIND range(0, size($profile_ids) - 1) AS i
+        MERGE (d:Deliverable {name: $deliverables[i]})
+        WITH i, d
+        MATCH (p) WHERE elementId(p) = $profile_ids[i]
+        CREATE (p)-[:PRODUCES_DELIVERABLE]->(d)
+        """
+        self._run_batched(query, {"profile_ids": profile_ids, "deliverables": deliverables}, session)
     
-    def batch_create_profile_deliverable_relationships(self, relationships: List[Dict]) -> None:
-        """Create multiple profile-deliverable relationships in a single transaction."""
-        with self.driver.session() as session:
-            query = """
-            UNWIND $relationships AS rel
-            MATCH (p:Profile {title: rel.profile_title})
-            MATCH (d:Deliverable {name: rel.deliverable})
-            CREATE (p)-[:PRODUCES_DELIVERABLE]->(d)
-            """
-            session.run(query, relationships=relationships)
+    def _periodic_iterate(self, outer: str, inner: str, params: Dict, session=None) -> None:
+        """Run inner over outer's rows in bounded batches via apoc.periodic.iterate.
+
+        Falls back to a single MATCH ... CREATE query when APOC is not installed.
+        """
+        session = session or self._session
+        # Auto-commit queries get no driver retries, so transient failures (deadlocks, leader switches)
+        # are retried here; the inner statement MERGEs so a retry cannot duplicate relationships.
+        # APOC itself retries a failed batch twice, then reports it in the result row.
+        for attempt in range(SIMILARITY_RETRIES):
+            try:
+                record = session.run("""
+                CALL apoc.periodic.iterate($outer, $inner, {batchSize: 1000, parallel: false, retries: 2, params: $params})
+                """, outer=outer, inner=inner, params=params).single()
+            except TransientError:
+                if attempt == SIMILARITY_RETRIES - 1:
+                    raise
+                time.sleep(2 ** attempt)
+                continue
+            except Exception as e:
+                if "apoc" not in str(e).lower():
+                    raise
+                print("Note: APOC not available; creating similarity relationships in one transaction.", file=sys.stderr)
+                # Same statement without the batching: drop outer's RETURN and write directly
+                self._write(outer.rsplit("RETURN", 1)[0] + inner, params, session)
+                return
+            errors = iterate_errors(record)
+            if not errors:
+                return
+            if attempt == SIMILARITY_RETRIES - 1 or not any(t in errors.lower() for t in _TRANSIENT_BATCH_ERRORS):
+                raise RuntimeError(f"apoc.periodic.iterate failed: {errors}")
+            time.sleep(2 ** attempt)
     
-    def create_skill_similarity_relationships(self, threshold: int = 2) -> None:
+    def create_skill_similarity_relationships(self, threshold: int = 2, session=None) -> None:
         """Create relationships between profiles that share skills."""
-        with self.driver.session() as session:
-            query = """
-            MATCH (p1:Profile)-[:HAS_SKILL]->(s:Skill)<-[:HAS_SKILL]-(p2:Profile)
-            WHERE id(p1) < id(p2)
-            WITH p1, p2, COUNT(s) AS shared_skills
-            WHERE shared_skills >= $threshold
-            CREATE (p1)-[:SHARES_SKILLS_WITH {count: shared_skills}]->(p2)
-            """
-            session.run(query, threshold=threshold)
+        outer = """
+        MATCH (p1:Profile)-[:HAS_SKILL]->(s:Skill)<-[:HAS_SKILL]-(p2:Profile)
+        WHERE elementId(p1) < elementId(p2)
+        WITH p1, p2, COUNT(s) AS shared_skills
+        WHERE shared_skills >= $threshold
+        RETURN p1, p2, shared_skills
+        """
+        inner = "MERGE (p1)-[r:SHARES_SKILLS_WITH]->(p2) SET r.count = shared_skills"
+        self._periodic_iterate(outer, inner, {"threshold": threshold}, session)
     
-    def create_knowledge_similarity_relationships(self, threshold: int = 2) -> None:
+    def create_knowledge_similarity_relationships(self, threshold: int = 2, session=None) -> None:
         """Create relationships between profiles that share knowledge areas."""
-        with self.driver.session() as session:
-            query = """
-            MATCH (p1:Profile)-[:REQUIRES_KNOWLEDGE]->(k:Knowledge)<-[:REQUIRES_KNOWLEDGE]-(p2:Profile)
-            WHERE id(p1) < id(p2)
-            WITH p1, p2, COUNT(k) AS shared_knowledge
-            WHERE shared_knowledge >= $threshold
-            CREATE (p1)-[:SHARES_KNOWLEDGE_WITH {count: shared_knowledge}]->(p2)
-            """
-            session.run(query, threshold=threshold)
-
+        outer = """
+        MATCH (p1:Profile)-[:REQUIRES_KNOWLEDGE]->(k:Knowledge)<-[:REQUIRES_KNOWLEDGE]-(p2:Profile)
+        WHERE elementId(p1) < elementId(p2)
+        WITH p1, p2, COUNT(k) AS shared_knowledge
+        WHERE shared_knowledge >= $threshold
+        RETURN p1, p2, shared_knowledge
+        """
+        inner = "MERGE (p1)-[r:SHARES_KNOWLEDGE_WITH]->(p2) SET r.count = shared_knowledge"
+        self._periodic_iterate(outer, inner, {"threshold": threshold}, session)
+    
+    def set_profile_counts(self, session=None) -> None:
+        """Store on each Skill/Knowledge node how many profiles require it (read by the top-N queries)."""
+        self._write("""
+        MATCH (s:Skill)
+        SET s.profile_count = COUNT { (s)<-[:HAS_SKILL]-(:Profile) }
+        """, session=session)
+        self._write("""
+        MATCH (k:Knowledge)
+        SET k.profile_count = COUNT { (k)<-[:REQUIRES_KNOWLEDGE]-(:Profile) }
+        """, session=session)
 
 def parse_multiline_field(field_value: str) -> List[str]:
     """Parse a field that contains multiple items separated by newlines or bullets."""
-    if pd.isna(field_value) or not field_value:
+    # Rows come from load_enisa_dataset as plain strings ('' for missing cells)
+    if not field_value:
         return []
     
-    field_str = str(field_value)
-    
-    # Split by newline
-    items = field_str.split('\n')
+    # Single-line cell: no split/loop needed
+    if '\n' not in field_value:
+        item = _BULLET_RE.sub('', field_value).strip()
+        return [item] if item else []
     
     parsed_items = []
-    for item in items:
-        # Clean the item
-        item = item.strip()
-        
-        # Remove bullet points and leading/trailing whitespace
-        item = item.lstrip('•').lstrip('-').lstrip('*').lstrip('○').strip()
+    for item in field_value.split('\n'):
+        # Remove leading bullet points/whitespace and trailing whitespace
+        item = _BULLET_RE.sub('', item).strip()
         
         # Skip empty items
-        if not item:
-            continue
-        
-        parsed_items.append(item)
+        if item:
+            parsed_items.append(item)
     
     return parsed_items
 
 
-def load_enisa_dataset(filepath: str) -> pd.DataFrame:
-    """Load the ENISA skill set dataset."""
+ENISA_COLUMNS = ['no', 'profile_title', 'mission', 'main_tasks', 'key_skills', 'key_knowledge', 'deliverables']
+
+
+def load_enisa_dataset(filepath: str) -> Iterator[Tuple[str, ...]]:
+    """Stream the ENISA skill set dataset as tuples of ENISA_COLUMNS ('' for missing cells)."""
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"ENISA dataset file not found: {filepath}")
     
-    df = pd.read_csv(filepath, encoding="utf-8")
-    print(f"Loaded ENISA dataset: {df.shape}", file=sys.stderr)
-    print(f"Columns: {list(df.columns)}", file=sys.stderr)
-    
-    return df
+    return _iter_enisa_rows(filepath)
+
+
+def _iter_enisa_rows(filepath: str) -> Iterator[Tuple[str, ...]]:
+    # Plain csv module: one row-oriented pass, no DataFrame is built or kept
+    with open(filepath, newline='', encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        print(f"Columns: {reader.fieldnames}", file=sys.stderr)
+        for row in reader:
+            yield tuple(row.get(c) or '' for c in ENISA_COLUMNS)
 
 
 def main():
@@ -232,9 +337,9 @@ def main():
     parser.add_argument("--password", "-p", type=str, required=True,
                        help="Neo4j password.")
     parser.add_argument("--clear", action="store_true",
-                       help="Clear existing data before import.")
-    parser.add_argument("--batch-size", type=int, default=100,
-                       help="Batch size for database operations.")
+                       help="Delete existing Profile/Knowledge/Deliverable nodes, and Skill nodes no Course uses, before import.")
+    parser.add_argument("--batch-size", type=int, default=10_000,
+                       help="Maximum rows per UNWIND query; smaller lists are sent in one query.")
     parser.add_argument("--skill-similarity-threshold", type=int, default=2,
                        help="Minimum number of shared skills to create similarity relationship.")
     parser.add_argument("--knowledge-similarity-threshold", type=int, default=2,
@@ -244,11 +349,11 @@ def main():
     
     # Load data
     print("Loading ENISA dataset...", file=sys.stderr)
-    df = load_enisa_dataset(args.dataset)
+    rows = load_enisa_dataset(args.dataset)
     
     # Initialize Neo4j connection
     print(f"Connecting to Neo4j at {args.uri}...", file=sys.stderr)
-    graph_builder = EnisaGraphBuilder(args.uri, args.user, args.password)
+    graph_builder = EnisaGraphBuilder(args.uri, args.user, args.password, batch_size=args.batch_size)
     
     try:
         # Clear database if requested
@@ -259,116 +364,59 @@ def main():
         print("Creating constraints and indexes...", file=sys.stderr)
         graph_builder.create_constraints()
         
-        # Prepare profile nodes
-        print("Preparing profile nodes...", file=sys.stderr)
+        # Extract profiles, skills, knowledge and deliverables in a single pass over the rows
+        print("Extracting profiles, skills, knowledge areas and deliverables...", file=sys.stderr)
         profiles = []
-        for idx, row in tqdm(df.iterrows(), total=len(df), desc="Preparing profiles"):
-            profile_data = {
-                'profile_no': int(row['no']),
-                'title': str(row['profile_title']),
-                'mission': str(row.get('mission', '')),
-                'main_tasks': str(row.get('main_tasks', ''))
-            }
-            profiles.append(profile_data)
-        
-        # Create profile nodes
-        print("Creating profile nodes...", file=sys.stderr)
-        for i in tqdm(range(0, len(profiles), args.batch_size), desc="Creating profiles"):
-            batch = profiles[i:i + args.batch_size]
-            graph_builder.batch_create_profiles(batch)
-        
-        # Extract and create skill nodes
-        print("Extracting skills...", file=sys.stderr)
-        all_skills: Set[str] = set()
-        profile_skills = []
-        
-        for idx, row in tqdm(df.iterrows(), total=len(df), desc="Processing skills"):
-            profile_title = str(row['profile_title'])
-            skills = parse_multiline_field(row.get('key_skills', ''))
-            
-            for skill in skills:
-                all_skills.add(skill)
-                profile_skills.append({
-                    'profile_title': profile_title,
-                    'skill': skill
-                })
-        
+        # Relationships as parallel (profile title, name) lists rather than one dict per edge
+        skill_titles, skill_names = [], []
+        knowledge_titles, knowledge_names = [], []
+        deliverable_titles, deliverable_names = [], []
+
+        for no, title, mission, main_tasks, key_skills, key_knowledge, deliverables in rows:
+            # Interned so every relationship of this row (and the sets below) share one string object
+            profile_title = sys.intern(title)
+            # Plain list rows instead of one dict per profile; keys are not repeated in the payload
+            profiles.append([int(no), profile_title, mission, main_tasks])
+
+            # dict.fromkeys drops repeats within the cell (keeping order) so no duplicate edges are sent
+            names = list(dict.fromkeys(map(sys.intern, parse_multiline_field(key_skills))))
+            skill_titles.extend([profile_title] * len(names))
+            skill_names.extend(names)
+
+            names = list(dict.fromkeys(map(sys.intern, parse_multiline_field(key_knowledge))))
+            knowledge_titles.extend([profile_title] * len(names))
+            knowledge_names.extend(names)
+
+            names = list(dict.fromkeys(map(sys.intern, parse_multiline_field(deliverables))))
+            deliverable_titles.extend([profile_title] * len(names))
+            deliverable_names.extend(names)
+
+        # Unique names in one pass over each (interned) name column
+        all_skills: Set[str] = set(skill_names)
+        all_knowledge: Set[str] = set(knowledge_names)
+        all_deliverables: Set[str] = set(deliverable_names)
+
+        print(f"Loaded {len(profiles)} profiles from the ENISA dataset.", file=sys.stderr)
         print(f"Found {len(all_skills)} unique skills.", file=sys.stderr)
-        
-        # Create skill nodes in batches
-        print("Creating skill nodes...", file=sys.stderr)
-        skills_list = list(all_skills)
-        for i in tqdm(range(0, len(skills_list), args.batch_size), desc="Creating skills"):
-            batch = skills_list[i:i + args.batch_size]
-            graph_builder.batch_create_skills(batch)
-        
-        # Create profile-skill relationships in batches
-        print("Creating profile-skill relationships...", file=sys.stderr)
-        for i in tqdm(range(0, len(profile_skills), args.batch_size), desc="Creating skill relationships"):
-            batch = profile_skills[i:i + args.batch_size]
-            graph_builder.batch_create_profile_skill_relationships(batch)
-        
-        # Extract and create knowledge nodes
-        print("Extracting knowledge areas...", file=sys.stderr)
-        all_knowledge: Set[str] = set()
-        profile_knowledge = []
-        
-        for idx, row in tqdm(df.iterrows(), total=len(df), desc="Processing knowledge"):
-            profile_title = str(row['profile_title'])
-            knowledge_items = parse_multiline_field(row.get('key_knowledge', ''))
-            
-            for knowledge in knowledge_items:
-                all_knowledge.add(knowledge)
-                profile_knowledge.append({
-                    'profile_title': profile_title,
-                    'knowledge': knowledge
-                })
-        
         print(f"Found {len(all_knowledge)} unique knowledge areas.", file=sys.stderr)
-        
-        # Create knowledge nodes in batches
-        print("Creating knowledge nodes...", file=sys.stderr)
-        knowledge_list = list(all_knowledge)
-        for i in tqdm(range(0, len(knowledge_list), args.batch_size), desc="Creating knowledge"):
-            batch = knowledge_list[i:i + args.batch_size]
-            graph_builder.batch_create_knowledge(batch)
-        
-        # Create profile-knowledge relationships in batches
-        print("Creating profile-knowledge relationships...", file=sys.stderr)
-        for i in tqdm(range(0, len(profile_knowledge), args.batch_size), desc="Creating knowledge relationships"):
-            batch = profile_knowledge[i:i + args.batch_size]
-            graph_builder.batch_create_profile_knowledge_relationships(batch)
-        
-        # Extract and create deliverable nodes
-        print("Extracting deliverables...", file=sys.stderr)
-        all_deliverables: Set[str] = set()
-        profile_deliverables = []
-        
-        for idx, row in tqdm(df.iterrows(), total=len(df), desc="Processing deliverables"):
-            profile_title = str(row['profile_title'])
-            deliverables = parse_multiline_field(row.get('deliverables', ''))
-            
-            for deliverable in deliverables:
-                all_deliverables.add(deliverable)
-                profile_deliverables.append({
-                    'profile_title': profile_title,
-                    'deliverable': deliverable
-                })
-        
         print(f"Found {len(all_deliverables)} unique deliverables.", file=sys.stderr)
+
+        # Create profile nodes
+        print("Creating profile nodes...", file=sys.stderr)
+        graph_builder.batch_create_profiles(profiles)
         
-        # Create deliverable nodes in batches
-        print("Creating deliverable nodes...", file=sys.stderr)
-        deliverables_list = list(all_deliverables)
-        for i in tqdm(range(0, len(deliverables_list), args.batch_size), desc="Creating deliverables"):
-            batch = deliverables_list[i:i + args.batch_size]
-            graph_builder.batch_create_deliverables(batch)
-        
-        # Create profile-deliverable relationships in batches
-        print("Creating profile-deliverable relationships...", file=sys.stderr)
-        for i in tqdm(range(0, len(profile_deliverables), args.batch_size), desc="Creating deliverable relationships"):
-            batch = profile_deliverables[i:i + args.batch_size]
-            graph_builder.batch_create_profile_deliverable_relationships(batch)
+        # Skill/Knowledge/Deliverable nodes are MERGEd by the relationship queries, which are independent of
+        # each other and run concurrently; profiles are addressed by elementId
+        print("Creating skill, knowledge and deliverable nodes and relationships...", file=sys.stderr)
+        profile_ids = graph_builder.get_profile_element_ids()
+        graph_builder.run_concurrently(
+            (graph_builder.batch_create_profile_skill_relationships,
+             [profile_ids[t] for t in skill_titles], skill_names),
+            (graph_builder.batch_create_profile_knowledge_relationships,
+             [profile_ids[t] for t in knowledge_titles], knowledge_names),
+            (graph_builder.batch_create_profile_deliverable_relationships,
+             [profile_ids[t] for t in deliverable_titles], deliverable_names),
+        )
         
         # Create similarity relationships
         print("Creating skill similarity relationships...", file=sys.stderr)
@@ -377,14 +425,17 @@ def main():
         print("Creating knowledge similarity relationships...", file=sys.stderr)
         graph_builder.create_knowledge_similarity_relationships(args.knowledge_similarity_threshold)
         
+        print("Storing skill and knowledge profile counts...", file=sys.stderr)
+        graph_builder.set_profile_counts()
+        
         print("\nGraph creation complete!", file=sys.stderr)
         print(f"- Created {len(profiles)} profile nodes", file=sys.stderr)
         print(f"- Created {len(all_skills)} skill nodes", file=sys.stderr)
         print(f"- Created {len(all_knowledge)} knowledge nodes", file=sys.stderr)
         print(f"- Created {len(all_deliverables)} deliverable nodes", file=sys.stderr)
-        print(f"- Created {len(profile_skills)} profile-skill relationships", file=sys.stderr)
-        print(f"- Created {len(profile_knowledge)} profile-knowledge relationships", file=sys.stderr)
-        print(f"- Created {len(profile_deliverables)} profile-deliverable relationships", file=sys.stderr)
+        print(f"- Created {len(skill_titles)} profile-skill relationships", file=sys.stderr)
+        print(f"- Created {len(knowledge_titles)} profile-knowledge relationships", file=sys.stderr)
+        print(f"- Created {len(deliverable_titles)} profile-deliverable relationships", file=sys.stderr)
         
     finally:
         graph_builder.close()
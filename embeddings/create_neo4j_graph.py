@@ -13,13 +13,36 @@ This script:
 
 import argparse
 import os
+import queue
 import sys
-from typing import List, Optional, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Tuple
 
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
-from sklearn.metrics.pairwise import cosine_similarity
+
+from apoc_results import iterate_errors
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 try:
     from neo4j import GraphDatabase
@@ -29,6 +52,27 @@ except ImportError:
     print("WARNING: neo4j package not installed. Install with: pip install neo4j", file=sys.stderr)
 
 
+# Field order of the course rows passed to batch_create_courses
+COURSE_ROW_FIELDS = ('course_id', 'title', 'description', 'original_description',
+                     'title_lc', 'description_lc', 'row_index', 'embedding')
+
+# Rows written per explicit transaction before it is committed
+COMMIT_ROWS = 50_000
+
+# GDS projection of the SIMILAR_TO links that query_neo4j_graph.py keeps in the server's catalog
+GDS_GRAPH_NAME = "course_similarity"
+
+
+def iter_batches(rows: Iterable, batch_size: int) -> Iterator[List]:
+    """Yield consecutive lists of up to batch_size items from any iterable."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
 class Neo4jGraphBuilder:
     """Build a Neo4j graph from course embeddings and metadata."""
     
@@ -59,11 +103,30 @@ class Neo4jGraphBuilder:
             except Exception as e:
                 print(f"Note: Could not create constraint: {e}", file=sys.stderr)
             
+            # Skill lookups by name back the MERGE of skill nodes and HAS_SKILL relationships
+            try:
+                session.run("CREATE CONSTRAINT skill_name_unique IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE")
+            except Exception as e:
+                print(f"Note: Could not create constraint: {e}", file=sys.stderr)
+            
             # Create index on course title
             try:
                 session.run("CREATE INDEX course_title_idx IF NOT EXISTS FOR (c:Course) ON (c.title)")
             except Exception as e:
                 print(f"Note: Could not create index: {e}", file=sys.stderr)
+            
+            # Text index for CONTAINS lookups on the lowercased title
+            try:
+                session.run("CREATE TEXT INDEX course_title_lc_text IF NOT EXISTS FOR (c:Course) ON (c.title_lc)")
+            except Exception as e:
+                print(f"Note: Could not create text index: {e}", file=sys.stderr)
+            
+            # Full-text index for Lucene searches over course titles/descriptions
+            try:
+                session.run("CREATE FULLTEXT INDEX course_text IF NOT EXISTS "
+                            "FOR (c:Course) ON EACH [c.title_lc, c.description_lc]")
+            except Exception as e:
+                print(f"Note: Could not create full-text index: {e}", file=sys.stderr)
     
     def create_course_node(self, course_data: Dict) -> None:
         """Create a Course node in Neo4j."""
@@ -74,6 +137,8 @@ class Neo4jGraphBuilder:
                 title: $title,
                 description: $description,
                 original_description: $original_description,
+                title_lc: toLower($title),
+                description_lc: toLower($description),
                 row_index: $row_index,
                 embedding: $embedding
             })
@@ -85,6 +150,7 @@ class Neo4jGraphBuilder:
         with self.driver.session() as session:
             query = """
             MERGE (s:Skill {name: $skill})
+            SET s.name_lc = toLower($skill)
             """
             session.run(query, skill=skill)
     
@@ -108,52 +174,168 @@ class Neo4jGraphBuilder:
             """
             session.run(query, course_id_1=course_id_1, course_id_2=course_id_2, similarity=similarity)
     
-    def batch_create_courses(self, courses: List[Dict]) -> None:
-        """Create multiple course nodes in a single transaction."""
+    def write_batches(self, write_batch: Callable, batches: Iterable[List]) -> int:
+        """Run write_batch(tx, batch) for each batch in explicit transactions, committing every COMMIT_ROWS rows."""
+        written = pending = 0
         with self.driver.session() as session:
-            query = """
-            UNWIND $courses AS course
-            CREATE (c:Course {
-                course_id: course.course_id,
-                title: course.title,
-                description: course.description,
-                original_description: course.original_description,
-                row_index: course.row_index,
-                embedding: course.embedding
-            })
-            """
-            session.run(query, courses=courses)
+            tx = session.begin_transaction()
+            try:
+                for batch in batches:
+                    write_batch(tx, batch)
+                    written += len(batch)
+                    pending += len(batch)
+                    if pending >= COMMIT_ROWS:
+                        tx.commit()
+                        tx = session.begin_transaction()
+                        pending = 0
+                tx.commit()
+            finally:
+                tx.close()  # Rolls back if the commit was not reached
+        return written
     
-    def batch_create_skills(self, skills: List[str]) -> None:
-        """Create multiple skill nodes in a single transaction."""
-        with self.driver.session() as session:
-            query = """
-            UNWIND $skills AS skill
-            MERGE (s:Skill {name: skill})
-            """
-            session.run(query, skills=skills)
+    def write_sharded(self, write_batch: Callable, rows: Iterable, batch_size: int,
+                      shard_of: Callable[..., int], workers: int,
+                      lock_key: Optional[Callable] = None) -> int:
+        """Write rows with parallel sessions, each owning the rows where shard_of(row) % workers is its index.
+        
+        Sessions are not thread-safe, so every worker opens its own; managed transactions retry the
+        batch if writes from two workers on a shared node deadlock. Each batch is sorted by lock_key
+        (the node other shards also lock) so workers take shared locks in the same order, which makes
+        such deadlocks rare. Rows are streamed: only a couple of batches per worker are buffered at a time.
+        """
+        def consume(batches: queue.Queue) -> int:
+            written, error = 0, None
+            with self.driver.session() as session:
+                for batch in iter(batches.get, None):
+                    if error is not None:
+                        continue  # Keep draining so the producer never blocks on a dead worker
+                    try:
+                        session.execute_write(write_batch, batch)
+                        written += len(batch)
+                    except Exception as e:
+                        error = e
+            if error is not None:
+                raise error
+            return written
+        
+        queues = [queue.Queue(maxsize=2) for _ in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(consume, q) for q in queues]
+            buffers = [[] for _ in range(workers)]
+            try:
+                for row in rows:
+                    shard = shard_of(row) % workers
+                    buffers[shard].append(row)
+                    if len(buffers[shard]) >= batch_size:
+                        queues[shard].put(sorted(buffers[shard], key=lock_key) if lock_key else buffers[shard])
+                        buffers[shard] = []
+                for q, buffer in zip(queues, buffers):
+                    if buffer:
+                        q.put(sorted(buffer, key=lock_key) if lock_key else buffer)
+            finally:
+                for q in queues:
+                    q.put(None)
+            return sum(future.result() for future in futures)
+    
+    def write_rows(self, write_batch: Callable, rows: Iterable, batch_size: int,
+                   shard_of: Callable[..., int], workers: int = 1,
+                   lock_key: Optional[Callable] = None) -> int:
+        """Write rows in batches: sharded across parallel sessions, or sequentially in explicit transactions."""
+        if workers > 1:
+            return self.write_sharded(write_batch, rows, batch_size, shard_of, workers, lock_key)
+        return self.write_batches(write_batch, iter_batches(rows, batch_size))
+    
+    def batch_create_courses(self, tx, courses: List[List]) -> None:
+        """Create multiple course nodes from rows ordered as COURSE_ROW_FIELDS (embedding may be absent)."""
+        query = """
+        UNWIND $courses AS row
+        CREATE (c:Course {
+            course_id: row[0],
+            title: row[1],
+            description: row[2],
+            original_description: row[3],
+            title_lc: row[4],
+            description_lc: row[5],
+            row_index: row[6],
+            embedding: row[7]
+        })
+        """
+        tx.run(query, courses=courses)
+    
+    def batch_create_skills(self, tx, skills: List[str]) -> None:
+        """Create multiple skill nodes in the given transaction."""
+        query = """
+        UNWIND $skills AS skill
+        MERGE (s:Skill {name: skill})
+        SET s.name_lc = toLower(skill)
+        """
+        tx.run(query, skills=skills)
     
-    def batch_create_course_skill_relationships(self, relationships: List[Dict]) -> None:
-        """Create multiple course-skill relationships in a single transaction."""
+    def batch_create_course_skill_relationships(self, tx, relationships: List[Dict]) -> None:
+        """Create (or keep) course-skill relationships in the given transaction; reruns add no duplicates."""
+        query = """
+        UNWIND $relationships AS rel
+        MATCH (c:Course {course_id: rel.course_id})
+        WITH rel, c
+        MATCH (s:Skill {name: rel.skill})
+        MERGE (c)-[:HAS_SKILL]->(s)
+        """
+        tx.run(query, relationships=relationships)
+    
+    def batch_create_similarity_relationships(self, tx, relationships: List[Dict]) -> None:
+        """Create or update similarity relationships in the given transaction; reruns add no duplicates."""
+        query = """
+        UNWIND $relationships AS rel
+        MATCH (c1:Course {course_id: rel.course_id_1})
+        WITH rel, c1
+        MATCH (c2:Course {course_id: rel.course_id_2})
+        MERGE (c1)-[r:SIMILAR_TO]->(c2)
+        SET r.similarity = rel.similarity
+        """
+        tx.run(query, relationships=relationships)
+    
+    def create_shared_skill_relationships(self, threshold: int = 2) -> None:
+        """Materialize SHARES_SKILLS_WITH {count} between courses sharing at least threshold skills.
+
+        Lets readers follow one edge instead of re-aggregating the Course-Skill-Course join. Runs in
+        batches via apoc.periodic.iterate, or as a single query when APOC is not installed.
+        """
+        outer = """
+        MATCH (c1:Course)-[:HAS_SKILL]->(s:Skill)<-[:HAS_SKILL]-(c2:Course)
+        WHERE elementId(c1) < elementId(c2)
+        WITH c1, c2, count(s) AS shared_skills
+        WHERE shared_skills >= $threshold
+        RETURN c1, c2, shared_skills
+        """
+        # r.threshold tells readers which min_shared values the materialized edges fully cover
+        inner = "MERGE (c1)-[r:SHARES_SKILLS_WITH]->(c2) SET r.count = shared_skills, r.threshold = $threshold"
         with self.driver.session() as session:
-            query = """
-            UNWIND $relationships AS rel
-            MATCH (c:Course {course_id: rel.course_id})
-            MATCH (s:Skill {name: rel.skill})
-            CREATE (c)-[:HAS_SKILL]->(s)
-            """
-            session.run(query, relationships=relationships)
+            try:
+                record = session.run("""
+                CALL apoc.periodic.iterate($outer, $inner, {batchSize: 1000, parallel: false, retries: 2, params: $params})
+                """, outer=outer, inner=inner, params={"threshold": threshold}).single()
+            except Exception as e:
+                if "apoc" not in str(e).lower():
+                    raise
+                print("Note: APOC not available; creating shared-skill relationships in one transaction.", file=sys.stderr)
+                query = outer.rsplit("RETURN", 1)[0] + inner
+                session.execute_write(lambda tx: tx.run(query, threshold=threshold).consume())
+                return
+        errors = iterate_errors(record)
+        if errors:
+            raise RuntimeError(f"Creating SHARES_SKILLS_WITH relationships failed: {errors}")
     
-    def batch_create_similarity_relationships(self, relationships: List[Dict]) -> None:
-        """Create multiple similarity relationships in a single transaction."""
+    def drop_similarity_projection(self) -> None:
+        """Drop the GDS similarity projection, so the next learning-path query re-projects the rebuilt graph.
+
+        The projection refers to internal node ids, which a rebuild invalidates. No-op without GDS.
+        """
         with self.driver.session() as session:
-            query = """
-            UNWIND $relationships AS rel
-            MATCH (c1:Course {course_id: rel.course_id_1})
-            MATCH (c2:Course {course_id: rel.course_id_2})
-            CREATE (c1)-[:SIMILAR_TO {similarity: rel.similarity}]->(c2)
-            """
-            session.run(query, relationships=relationships)
+            try:
+                session.run("CALL gds.graph.drop($graph, false)", graph=GDS_GRAPH_NAME).consume()
+            except Exception as e:
+                if "gds." not in str(e).lower():
+                    raise
 
 
 def load_embeddings(embeddings_path: str, metadata_path: str) -> Tuple[np.ndarray, pd.DataFrame]:
@@ -163,7 +345,8 @@ def load_embeddings(embeddings_path: str, metadata_path: str) -> Tuple[np.ndarra
     if not os.path.exists(metadata_path):
         raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
     
-    embeddings = np.load(embeddings_path)
+    # Memory-mapped: rows are paged in on demand; the similarity step makes its own float32 copy
+    embeddings = np.load(embeddings_path, mmap_mode='r')
     metadata = pd.read_csv(metadata_path)
     
     print(f"Loaded embeddings: {embeddings.shape}", file=sys.stderr)
@@ -183,51 +366,238 @@ def load_original_dataset(dataset_path: str) -> pd.DataFrame:
     return df
 
 
-def compute_similarity_matrix(embeddings: np.ndarray) -> np.ndarray:
-    """Compute cosine similarity matrix for embeddings."""
-    print("Computing similarity matrix...", file=sys.stderr)
-    similarity_matrix = cosine_similarity(embeddings)
-    return similarity_matrix
+def quantize_int8(embeddings: np.ndarray) -> np.ndarray:
+    """Symmetric per-vector int8 quantization (cosine is scale-invariant, so no scales are kept)."""
+    max_abs = np.max(np.abs(embeddings), axis=1, keepdims=True)
+    scale = 127.0 / np.where(max_abs > 0, max_abs, 1.0)
+    return np.round(embeddings * scale).astype(np.int8)
+
+
+# Rows per similarity tile: a 256 x N float32 block stays cache-resident for typical course counts
+SIMILARITY_TILE_ROWS = 256
+
+
+def l2_normalize(embeddings: np.ndarray) -> np.ndarray:
+    """Float32 copy of the embeddings with unit-length rows (zero rows stay zero)."""
+    vectors = np.array(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms > 0, norms, 1.0)
+    return vectors
+
+
+def cluster_row_order(embeddings: np.ndarray, iterations: int = 5, seed: int = 0) -> np.ndarray:
+    """Row permutation that places spherical k-means (k = sqrt(N)) cluster-mates next to each other."""
+    vectors = l2_normalize(embeddings)
+    n, dim = vectors.shape
+    k = max(1, int(np.sqrt(n)))
+    if FAISS_AVAILABLE:
+        kmeans = faiss.Kmeans(dim, k, niter=iterations, seed=seed, spherical=True)
+        kmeans.train(vectors)
+        _, assign = kmeans.index.search(vectors, 1)
+        return np.argsort(assign.ravel(), kind="stable")
+    
+    centroids = vectors[np.random.default_rng(seed).choice(n, k, replace=False)]
+    for _ in range(iterations):
+        assign = np.concatenate([
+            np.argmax(vectors[start:start + SIMILARITY_TILE_ROWS] @ centroids.T, axis=1)
+            for start in range(0, n, SIMILARITY_TILE_ROWS)
+        ])
+        # Sum members per cluster in one pass over the cluster-sorted rows; empty clusters keep their centroid
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=k)
+        filled = counts > 0
+        centroids[filled] = l2_normalize(np.add.reduceat(vectors[order], (np.cumsum(counts) - counts)[filled], axis=0))
+    return order
+
+
+def iter_similarity_tiles(embeddings: np.ndarray, int8: bool = False):
+    """Yield (start, block) row tiles of the cosine similarity matrix without building the full N x N matrix."""
+    if int8:
+        embeddings = quantize_int8(embeddings)
+    if SIMSIMD_AVAILABLE:
+        # SIMD cosine kernels (int8 ones for quantized input)
+        vectors = embeddings if int8 else np.array(embeddings, dtype=np.float32)  # In-memory copy of the mmap
+        for start in range(0, len(vectors), SIMILARITY_TILE_ROWS):
+            tile = vectors[start:start + SIMILARITY_TILE_ROWS]
+            yield start, 1.0 - np.asarray(simsimd.cdist(tile, vectors, metric="cosine"), dtype=np.float32)
+        return
+    
+    # Normalize once, then each tile is a single BLAS GEMM
+    vectors = l2_normalize(embeddings)
+    for start in range(0, len(vectors), SIMILARITY_TILE_ROWS):
+        yield start, vectors[start:start + SIMILARITY_TILE_ROWS] @ vectors.T
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True)
+    def _push_top_k(row_idx, row_scores, filled, j, score):
+        """Insert (j, score) into a descending top-k buffer holding `filled` entries; returns the new fill."""
+        top_k = len(row_scores)
+        if filled < top_k:
+            pos = filled
+            filled += 1
+        elif score > row_scores[top_k - 1]:
+            pos = top_k - 1
+        else:
+            return filled
+        while pos > 0 and row_scores[pos - 1] < score:
+            row_scores[pos] = row_scores[pos - 1]
+            row_idx[pos] = row_idx[pos - 1]
+            pos -= 1
+        row_scores[pos] = score
+        row_idx[pos] = j
+        return filled
+    
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _top_k_above_threshold(similarity, top_k, threshold, row_offset):
+        """Per row, the top_k (column, score) pairs >= threshold excluding self, best first; -1 pads."""
+        n_rows, n = similarity.shape
+        out_idx = np.full((n_rows, top_k), -1, dtype=np.int64)
+        out_scores = np.zeros((n_rows, top_k), dtype=np.float32)
+        for r in numba.prange(n_rows):
+            filled = 0
+            for j in range(n):
+                score = similarity[r, j]
+                if j != r + row_offset and score >= threshold:
+                    filled = _push_top_k(out_idx[r], out_scores[r], filled, j, score)
+        return out_idx, out_scores
+    
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _fused_similarity_top_k(vectors, vectors_t, top_k, threshold, tile):
+        """Top-k cosine neighbours per row of L2-normalized vectors; similarities are computed one
+        column tile at a time (vectors_t is the contiguous transpose) and discarded after the top-k update."""
+        n, dim = vectors.shape
+        out_idx = np.full((n, top_k), -1, dtype=np.int64)
+        out_scores = np.zeros((n, top_k), dtype=np.float32)
+        for i in numba.prange(n):
+            scores = np.empty(tile, dtype=np.float32)
+            filled = 0
+            for j0 in range(0, n, tile):
+                j1 = min(j0 + tile, n)
+                scores[:j1 - j0] = 0.0
+                for d in range(dim):
+                    v = vectors[i, d]
+                    for j in range(j0, j1):  # Contiguous row of vectors_t, vectorizes
+                        scores[j - j0] += v * vectors_t[d, j]
+                for j in range(j0, j1):
+                    score = scores[j - j0]
+                    if j != i and score >= threshold:
+                        filled = _push_top_k(out_idx[i], out_scores[i], filled, j, score)
+        return out_idx, out_scores
 
 
 def get_top_similar_courses(similarity_matrix: np.ndarray, 
                             top_k: int = 5, 
-                            threshold: float = 0.5) -> List[Tuple[int, int, float]]:
-    """Get top-k similar courses for each course above a threshold."""
-    similar_courses = []
+                            threshold: float = 0.5,
+                            row_offset: int = 0) -> List[Tuple[int, int, float]]:
+    """Get top-k similar courses for each row of a similarity block (rows start at course row_offset)."""
+    n_rows, n = similarity_matrix.shape
+    if n_rows == 0 or top_k <= 0:
+        return []
     
-    for i in range(len(similarity_matrix)):
-        # Get similarity scores for course i
-        scores = similarity_matrix[i]
-        
-        # Get indices sorted by similarity (excluding self)
-        sorted_indices = np.argsort(scores)[::-1]
-        
+    if NUMBA_AVAILABLE:
+        candidates, scores = _top_k_above_threshold(
+            np.ascontiguousarray(similarity_matrix), top_k, np.float32(threshold), row_offset
+        )
+        rows, cols = np.nonzero(candidates >= 0)
+        return [(int(i) + row_offset, int(j), float(sim))
+                for i, j, sim in zip(rows, candidates[rows, cols], scores[rows, cols])]
+    
+    # top_k + 1 candidates per row (self is usually among them), found in O(N) per row instead of a full sort
+    k = min(top_k + 1, n)
+    candidates = np.argpartition(similarity_matrix, n - k, axis=1)[:, n - k:]
+    scores = np.take_along_axis(similarity_matrix, candidates, axis=1)
+    order = np.argsort(-scores, axis=1, kind="stable")
+    candidates = np.take_along_axis(candidates, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+    
+    # Drop self and below-threshold scores, then keep the first top_k survivors of each row
+    keep = (candidates != (np.arange(n_rows) + row_offset)[:, None]) & (scores >= threshold)
+    keep &= np.cumsum(keep, axis=1) <= top_k
+    rows, cols = np.nonzero(keep)
+    
+    return [(int(i) + row_offset, int(j), float(sim))
+            for i, j, sim in zip(rows, candidates[rows, cols], scores[rows, cols])]
+
+
+# Columns scored per inner tile of the fused Numba kernel (a small per-thread float32 buffer)
+FUSED_TILE_COLUMNS = 1024
+
+# Up to this many courses the FAISS search is exact (flat inner-product index); above it HNSW is used
+FAISS_EXACT_MAX_ROWS = 50_000
+
+
+def search_top_similar_courses(embeddings: np.ndarray,
+                               top_k: int = 5,
+                               threshold: float = 0.5) -> Iterator[Tuple[int, int, float]]:
+    """Yield top-k similar courses per course from a FAISS index, without building the N x N matrix."""
+    vectors = np.array(embeddings, dtype=np.float32, order="C")  # normalize_L2 works in place
+    faiss.normalize_L2(vectors)
+    n, dim = vectors.shape
+    
+    if n <= FAISS_EXACT_MAX_ROWS:
+        index = faiss.IndexFlatIP(dim)
+    else:
+        index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 200
+        index.hnsw.efSearch = max(64, 2 * (top_k + 1))
+    index.add(vectors)
+    
+    # top_k + 1 because each course normally finds itself first
+    scores, neighbors = index.search(vectors, min(top_k + 1, n))
+    
+    for i in range(n):
         count = 0
-        for j in sorted_indices:
-            if i == j:  # Skip self-similarity
+        for j, score in zip(neighbors[i], scores[i]):
+            if j < 0 or j == i:  # Padding or self-similarity
                 continue
-            if scores[j] < threshold:  # Below threshold
+            if score < threshold or count >= top_k:
                 break
-            if count >= top_k:  # Reached top-k
-                break
-            
-            similar_courses.append((i, j, float(scores[j])))
+            yield i, int(j), float(score)
             count += 1
-    
-    return similar_courses
 
 
-def parse_skills(skills_str: str) -> List[str]:
-    """Parse skills from comma-separated string."""
-    if pd.isna(skills_str) or not skills_str:
-        return []
+def iter_similar_courses(embeddings: np.ndarray,
+                         top_k: int = 5,
+                         threshold: float = 0.5,
+                         int8: bool = False,
+                         cluster_order: bool = False) -> Iterator[Tuple[int, int, float]]:
+    """Yield top-k similar course pairs above threshold: FAISS, else the fused Numba kernel, else tiled blocks.
+    
+    cluster_order runs the kernel/tiles on rows regrouped by k-means so similar courses share tiles;
+    pairs are mapped back to the original row numbers.
+    """
+    if FAISS_AVAILABLE and not int8:
+        yield from search_top_similar_courses(embeddings, top_k=top_k, threshold=threshold)
+        return
     
-    # Split by comma and clean
-    skills = [s.strip() for s in str(skills_str).split(",")]
-    skills = [s for s in skills if s]  # Remove empty strings
+    if cluster_order and len(embeddings):
+        print("Reordering embeddings by k-means cluster...", file=sys.stderr)
+        order = cluster_row_order(embeddings)
+        for i, j, sim in iter_similar_courses(np.asarray(embeddings)[order], top_k, threshold, int8):
+            yield int(order[i]), int(order[j]), sim
+        return
     
-    return skills
+    if NUMBA_AVAILABLE and not int8 and top_k > 0 and len(embeddings):
+        print("Computing similarity with the fused Numba kernel...", file=sys.stderr)
+        vectors = l2_normalize(embeddings)
+        candidates, scores = _fused_similarity_top_k(
+            vectors, np.ascontiguousarray(vectors.T), top_k, np.float32(threshold), FUSED_TILE_COLUMNS
+        )
+        rows, cols = np.nonzero(candidates >= 0)
+        for i, j, sim in zip(rows.tolist(), candidates[rows, cols].tolist(), scores[rows, cols].tolist()):
+            yield i, j, sim
+        return
+    
+    print("Computing similarity in row tiles...", file=sys.stderr)
+    for start, block in iter_similarity_tiles(embeddings, int8=int8):
+        yield from get_top_similar_courses(block, top_k=top_k, threshold=threshold, row_offset=start)
+
+
+def parse_skills_column(skills: pd.Series) -> pd.Series:
+    """Split a column of comma-separated skills into one stripped, non-empty skill per row (index kept)."""
+    parts = skills.dropna().astype(str).str.split(",").explode().str.strip()
+    return parts[parts.notna() & (parts != "")]
 
 
 def main():
@@ -250,8 +620,20 @@ def main():
                        help="Number of top similar courses to link.")
     parser.add_argument("--similarity-threshold", type=float, default=0.5, 
                        help="Minimum similarity score for creating relationships.")
-    parser.add_argument("--batch-size", type=int, default=100, 
+    parser.add_argument("--int8-similarity", action="store_true",
+                       help="Rank similarities on int8-quantized embeddings (matrix path, uses simsimd's int8 kernels). "
+                            "Stored node embeddings stay float32.")
+    parser.add_argument("--cluster-order", action="store_true",
+                       help="Regroup rows by k-means cluster before the tiled/Numba similarity pass (not used with FAISS search).")
+    parser.add_argument("--no-store-embeddings", action="store_true",
+                       help="Do not store embedding vectors on Course nodes (they stay in the .npy file).")
+    parser.add_argument("--shared-skills-threshold", type=int, default=2,
+                       help="Minimum shared skills for a SHARES_SKILLS_WITH relationship between courses.")
+    parser.add_argument("--batch-size", type=int, default=5000, 
                        help="Batch size for database operations.")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="Parallel Neo4j sessions for writes, sharded by course id (default 1 = sequential). "
+                            "Workers share Skill and target Course nodes, so larger values rely on deadlock retries.")
     
     args = parser.parse_args()
     
@@ -275,87 +657,92 @@ def main():
         
         # Prepare course nodes
         print("Preparing course nodes...", file=sys.stderr)
-        courses = []
-        for idx, row in tqdm(metadata.iterrows(), total=len(metadata), desc="Preparing courses"):
-            row_index = int(row['row_index'])
-            
-            # Get course data from original dataset
-            course_row = df.iloc[row_index]
-            
-            course_data = {
-                'course_id': int(idx),
-                'title': str(course_row.get('course_title', '')),
-                'description': str(course_row.get('Description', '')),
-                'original_description': str(course_row.get('original_description', '')),
-                'row_index': row_index,
-                'embedding': embeddings[idx].tolist()
-            }
-            courses.append(course_data)
+        # Gather all referenced dataset rows at once and convert embeddings to lists in a single call
+        row_indices = metadata['row_index'].astype(int).tolist()
+        text_cols = ['course_title', 'Description', 'original_description']
+        course_rows = df.reindex(columns=text_cols).iloc[row_indices].fillna('').astype(str)
+        # Columns in COURSE_ROW_FIELDS order, zipped into list rows (no per-course dicts)
+        columns = [
+            metadata.index.tolist(),
+            course_rows['course_title'].tolist(),
+            course_rows['Description'].tolist(),
+            course_rows['original_description'].tolist(),
+            course_rows['course_title'].str.lower().tolist(),
+            course_rows['Description'].str.lower().tolist(),
+            row_indices
+        ]
+        # Without the trailing embedding, row[7] is null and the property is left unset
+        if not args.no_store_embeddings:
+            columns.append(embeddings.astype(np.float32, copy=False).tolist())
+        courses = [list(row) for row in zip(*columns)]
         
         # Create course nodes in batches
         print("Creating course nodes...", file=sys.stderr)
-        for i in tqdm(range(0, len(courses), args.batch_size), desc="Creating courses"):
-            batch = courses[i:i + args.batch_size]
-            graph_builder.batch_create_courses(batch)
+        graph_builder.write_rows(
+            graph_builder.batch_create_courses,
+            tqdm(courses, desc="Creating courses"), args.batch_size,
+            shard_of=itemgetter(0), workers=args.workers
+        )
         
         # Extract and create skill nodes
         print("Extracting skills...", file=sys.stderr)
-        all_skills = set()
-        course_skills = []
-        
-        for idx, row in tqdm(df.iterrows(), total=len(df), desc="Processing skills"):
-            skills = parse_skills(row.get('extracted_skills', ''))
-            for skill in skills:
-                all_skills.add(skill)
-                course_skills.append({
-                    'course_id': int(idx),
-                    'skill': skill
-                })
+        skills = parse_skills_column(df['extracted_skills']) if 'extracted_skills' in df.columns else pd.Series(dtype=object)
+        course_skills = [
+            {'course_id': course_id, 'skill': skill}
+            for course_id, skill in zip(skills.index.tolist(), skills.tolist())
+        ]
+        all_skills = set(skills.unique())
         
         print(f"Found {len(all_skills)} unique skills.", file=sys.stderr)
         
         # Create skill nodes in batches
         print("Creating skill nodes...", file=sys.stderr)
         skills_list = list(all_skills)
-        for i in tqdm(range(0, len(skills_list), args.batch_size), desc="Creating skills"):
-            batch = skills_list[i:i + args.batch_size]
-            graph_builder.batch_create_skills(batch)
+        graph_builder.write_rows(
+            graph_builder.batch_create_skills,
+            tqdm(skills_list, desc="Creating skills"), args.batch_size,
+            shard_of=hash, workers=args.workers
+        )
         
         # Create course-skill relationships in batches
         print("Creating course-skill relationships...", file=sys.stderr)
-        for i in tqdm(range(0, len(course_skills), args.batch_size), desc="Creating relationships"):
-            batch = course_skills[i:i + args.batch_size]
-            graph_builder.batch_create_course_skill_relationships(batch)
-        
-        # Compute similarity and create similarity relationships
-        print("Computing course similarities...", file=sys.stderr)
-        similarity_matrix = compute_similarity_matrix(embeddings)
-        
-        print("Finding similar courses...", file=sys.stderr)
-        similar_courses = get_top_similar_courses(
-            similarity_matrix, 
-            top_k=args.top_k, 
-            threshold=args.similarity_threshold
+        graph_builder.write_rows(
+            graph_builder.batch_create_course_skill_relationships,
+            tqdm(course_skills, desc="Creating relationships"), args.batch_size,
+            shard_of=itemgetter('course_id'), workers=args.workers, lock_key=itemgetter('skill')
         )
         
-        print(f"Found {len(similar_courses)} similarity relationships.", file=sys.stderr)
-        
-        # Create similarity relationships in batches
+        # Stream similar course pairs straight into batched writes (only one batch is held in memory)
         print("Creating similarity relationships...", file=sys.stderr)
-        similarity_rels = [
-            {'course_id_1': int(c1), 'course_id_2': int(c2), 'similarity': float(sim)}
-            for c1, c2, sim in similar_courses
-        ]
+        similar_pairs = iter_similar_courses(
+            embeddings,
+            top_k=args.top_k,
+            threshold=args.similarity_threshold,
+            int8=args.int8_similarity,
+            cluster_order=args.cluster_order
+        )
+        similarity_rels = (
+            {'course_id_1': c1, 'course_id_2': c2, 'similarity': sim}
+            for c1, c2, sim in tqdm(similar_pairs, desc="Creating similarities")
+        )
+        similarity_count = graph_builder.write_rows(
+            graph_builder.batch_create_similarity_relationships,
+            similarity_rels, args.batch_size,
+            shard_of=itemgetter('course_id_1'), workers=args.workers, lock_key=itemgetter('course_id_2')
+        )
+        
+        # Precompute course pairs sharing skills (read by find_courses_with_shared_skills)
+        print("Creating shared-skill relationships...", file=sys.stderr)
+        graph_builder.create_shared_skill_relationships(args.shared_skills_threshold)
         
-        for i in tqdm(range(0, len(similarity_rels), args.batch_size), desc="Creating similarities"):
-            batch = similarity_rels[i:i + args.batch_size]
-            graph_builder.batch_create_similarity_relationships(batch)
+        # A learning-path projection from before this import now points at stale node ids
+        graph_builder.drop_similarity_projection()
         
         print("\nGraph creation complete!", file=sys.stderr)
         print(f"- Created {len(courses)} course nodes", file=sys.stderr)
         print(f"- Created {len(all_skills)} skill nodes", file=sys.stderr)
         print(f"- Created {len(course_skills)} course-skill relationships", file=sys.stderr)
-        print(f"- Created {len(similar_courses)} similarity relationships", file=sys.stderr)
+        print(f"- Created {similarity_count} similarity relationships", file=sys.stderr)
         
     finally:
         graph_builder.close()
@@ -13,8 +13,10 @@ Prerequisites:
 """
 
 import argparse
+import re
 import sys
-from typing import List, Dict
+from collections import Counter, defaultdict
+from typing import List, Dict, Set
 
 try:
     from neo4j import GraphDatabase
@@ -24,6 +26,17 @@ except ImportError:
     print("WARNING: neo4j package not installed. Install with: pip install neo4j", file=sys.stderr)
 
 
+# Rows per write transaction when creating integration relationships
+BATCH_SIZE = 10_000
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> Set[str]:
+    """Lowercased word tokens of a string."""
+    return set(_TOKEN_RE.findall(text.lower())) if text else set()
+
+
 class GraphIntegrator:
     """Integrate ENISA profiles graph with course embeddings graph."""
     
@@ -33,6 +46,8 @@ class GraphIntegrator:
             raise ImportError("neo4j package is required. Install with: pip install neo4j")
         
         self.driver = GraphDatabase.driver(uri, auth=(user, password))
+        self._course_index = None
+        self._matches = {}
     
     def close(self):
         """Close the Neo4j connection."""
@@ -42,8 +57,13 @@ class GraphIntegrator:
     def check_graphs_exist(self) -> Dict[str, bool]:
         """Check if both graphs exist in the database."""
         with self.driver.session() as session:
-            profile_count = session.run("MATCH (p:Profile) RETURN count(p) AS count").single()["count"]
-            course_count = session.run("MATCH (c:Course) RETURN count(c) AS count").single()["count"]
+            # One round-trip; label counts are served from Neo4j's count store
+            record = session.run("""
+                CALL { MATCH (p:Profile) RETURN count(p) AS profile_count }
+                CALL { MATCH (c:Course) RETURN count(c) AS course_count }
+                RETURN profile_count, course_count
+            """).single()
+            profile_count, course_count = record["profile_count"], record["course_count"]
             
             return {
                 'enisa_graph': profile_count > 0,
@@ -52,26 +72,105 @@ class GraphIntegrator:
                 'course_count': course_count
             }
     
+    def _course_token_index(self) -> Dict[str, Set[str]]:
+        """Inverted index token -> Course elementIds over titles and descriptions (one read scan, cached)."""
+        if self._course_index is None:
+            index = defaultdict(set)
+            with self.driver.session() as session:
+                for record in session.run("""
+                    MATCH (c:Course)
+                    RETURN elementId(c) AS id,
+                           coalesce(c.title_lc, c.title) AS title,
+                           coalesce(c.description_lc, c.description) AS description
+                """):
+                    for token in tokenize(record["title"]) | tokenize(record["description"]):
+                        index[token].add(record["id"])
+            self._course_index = index
+        return self._course_index
+    
+    def match_courses(self, label: str) -> Dict[str, Set[str]]:
+        """Map elementId of each `label` node to the Courses whose text contains all tokens of its name."""
+        if label not in self._matches:
+            index = self._course_token_index()
+            matches = {}
+            with self.driver.session() as session:
+                for record in session.run(
+                    "MATCH (n:%s) RETURN elementId(n) AS id, coalesce(n.name_lc, n.name) AS name" % label
+                ):
+                    tokens = tokenize(record["name"])
+                    if not tokens:
+                        continue
+                    # Intersect from the rarest token so the working set stays small
+                    postings = sorted((index.get(t, set()) for t in tokens), key=len)
+                    courses = set(postings[0]).intersection(*postings[1:])
+                    if courses:
+                        matches[record["id"]] = courses
+            self._matches[label] = matches
+        return self._matches[label]
+    
+    def _write_pairs(self, query: str, columns: Dict[str, List]) -> int:
+        """Run an UNWIND query over equal-length parameter lists in BATCH_SIZE transactions; returns rows written."""
+        n = len(next(iter(columns.values())))
+        with self.driver.session() as session:
+            for i in range(0, n, BATCH_SIZE):
+                batch = {k: v[i:i + BATCH_SIZE] for k, v in columns.items()}
+                session.execute_write(lambda tx: tx.run(query, batch).consume())
+        return n
+    
+    def _profile_course_counts(self, rel_type: str, label: str) -> Counter:
+        """Count, per (profile, course) pair, the distinct `label` nodes linking them through text matches."""
+        matches = self.match_courses(label)
+        counts = Counter()
+        with self.driver.session() as session:
+            for record in session.run(
+                "MATCH (p:Profile)-[:%s]->(n:%s) RETURN DISTINCT elementId(p) AS profile, elementId(n) AS node"
+                % (rel_type, label)
+            ):
+                for course in matches.get(record["node"], ()):
+                    counts[(record["profile"], course)] += 1
+        return counts
+    
+    def _write_profile_course_counts(self, counts: Counter, rel_type: str, count_property: str) -> int:
+        """MERGE (profile)-[rel_type {count_property}]->(course) for each counted pair, matched by elementId."""
+        if not counts:
+            return 0
+        query = """
+            UNWIND range(0, size($profile_ids) - 1) AS i
+            MATCH (p) WHERE elementId(p) = $profile_ids[i]
+            MATCH (c) WHERE elementId(c) = $course_ids[i]
+            MERGE (p)-[r:%s {%s: $counts[i]}]->(c)
+        """ % (rel_type, count_property)
+        return self._write_pairs(query, {
+            "profile_ids": [p for p, _ in counts],
+            "course_ids": [c for _, c in counts],
+            "counts": list(counts.values())
+        })
+    
+    def _write_node_course_pairs(self, label: str, rel_type: str) -> int:
+        """MERGE (node)-[rel_type]->(course) for every text match of a `label` node."""
+        matches = self.match_courses(label)
+        node_ids = [n for n, courses in matches.items() for _ in courses]
+        course_ids = [c for courses in matches.values() for c in courses]
+        if not node_ids:
+            return 0
+        query = """
+            UNWIND range(0, size($node_ids) - 1) AS i
+            MATCH (n) WHERE elementId(n) = $node_ids[i]
+            MATCH (c) WHERE elementId(c) = $course_ids[i]
+            MERGE (n)-[:%s]->(c)
+        """ % rel_type
+        return self._write_pairs(query, {"node_ids": node_ids, "course_ids": course_ids})
+    
     def create_profile_course_relationships_by_skill(self, similarity_threshold: float = 0.3) -> int:
         """
         Create relationships between profiles and courses based on skill matching.
         
-        Matches course titles/descriptions containing skill keywords.
+        Matches course titles/descriptions containing all words of a skill name
+        (token inverted index built in Python).
         Returns number of relationships created.
         """
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (p:Profile)-[:HAS_SKILL]->(s:Skill)
-                MATCH (c:Course)
-                WHERE toLower(c.title) CONTAINS toLower(s.name) 
-                   OR toLower(c.description) CONTAINS toLower(s.name)
-                WITH p, c, COUNT(DISTINCT s) AS matching_skills
-                WHERE matching_skills > 0
-                MERGE (p)-[r:RELEVANT_COURSE {matching_skills: matching_skills}]->(c)
-                RETURN COUNT(r) AS relationships_created
-            """)
-            count = result.single()["relationships_created"]
-            return count
+        counts = self._profile_course_counts("HAS_SKILL", "Skill")
+        return self._write_profile_course_counts(counts, "RELEVANT_COURSE", "matching_skills")
     
     def create_profile_course_relationships_by_knowledge(self) -> int:
         """
@@ -79,19 +178,8 @@ class GraphIntegrator:
         
         Returns number of relationships created.
         """
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (p:Profile)-[:REQUIRES_KNOWLEDGE]->(k:Knowledge)
-                MATCH (c:Course)
-                WHERE toLower(c.title) CONTAINS toLower(k.name) 
-                   OR toLower(c.description) CONTAINS toLower(k.name)
-                WITH p, c, COUNT(DISTINCT k) AS matching_knowledge
-                WHERE matching_knowledge > 0
-                MERGE (p)-[r:TEACHES_KNOWLEDGE {matching_knowledge: matching_knowledge}]->(c)
-                RETURN COUNT(r) AS relationships_created
-            """)
-            count = result.single()["relationships_created"]
-            return count
+        counts = self._profile_course_counts("REQUIRES_KNOWLEDGE", "Knowledge")
+        return self._write_profile_course_counts(counts, "TEACHES_KNOWLEDGE", "matching_knowledge")
     
     def create_skill_course_relationships(self) -> int:
         """
@@ -99,17 +187,7 @@ class GraphIntegrator:
         
         Returns number of relationships created.
         """
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (s:Skill)
-                MATCH (c:Course)
-                WHERE toLower(c.title) CONTAINS toLower(s.name) 
-                   OR toLower(c.description) CONTAINS toLower(s.name)
-                MERGE (s)-[r:TAUGHT_IN]->(c)
-                RETURN COUNT(r) AS relationships_created
-            """)
-            count = result.single()["relationships_created"]
-            return count
+        return self._write_node_course_pairs("Skill", "TAUGHT_IN")
     
     def create_knowledge_course_relationships(self) -> int:
         """
@@ -117,17 +195,7 @@ class GraphIntegrator:
         
         Returns number of relationships created.
         """
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (k:Knowledge)
-                MATCH (c:Course)
-                WHERE toLower(c.title) CONTAINS toLower(k.name) 
-                   OR toLower(c.description) CONTAINS toLower(k.name)
-                MERGE (k)-[r:COVERED_IN]->(c)
-                RETURN COUNT(r) AS relationships_created
-            """)
-            count = result.single()["relationships_created"]
-            return count
+        return self._write_node_course_pairs("Knowledge", "COVERED_IN")
     
     def create_career_pathway_with_courses(self, from_profile: str, to_profile: str) -> Dict:
         """
@@ -166,30 +234,19 @@ class GraphIntegrator:
     def get_integration_statistics(self) -> Dict:
         """Get statistics about the integrated graph."""
         with self.driver.session() as session:
-            stats = {}
-            
-            # Profile-Course relationships
-            profile_course = session.run("""
-                MATCH (p:Profile)-[r:RELEVANT_COURSE]->(c:Course)
-                RETURN COUNT(r) AS count
+            # One round-trip; a label on one side only lets each count use the count store
+            record = session.run("""
+                CALL { MATCH (:Profile)-[r:RELEVANT_COURSE]->() RETURN count(r) AS profile_course }
+                CALL { MATCH (:Skill)-[r:TAUGHT_IN]->() RETURN count(r) AS skill_course }
+                CALL { MATCH (:Knowledge)-[r:COVERED_IN]->() RETURN count(r) AS knowledge_course }
+                RETURN profile_course, skill_course, knowledge_course
             """).single()
-            stats['profile_course_relationships'] = profile_course['count']
             
-            # Skill-Course relationships
-            skill_course = session.run("""
-                MATCH (s:Skill)-[r:TAUGHT_IN]->(c:Course)
-                RETURN COUNT(r) AS count
-            """).single()
-            stats['skill_course_relationships'] = skill_course['count']
-            
-            # Knowledge-Course relationships
-            knowledge_course = session.run("""
-                MATCH (k:Knowledge)-[r:COVERED_IN]->(c:Course)
-                RETURN COUNT(r) AS count
-            """).single()
-            stats['knowledge_course_relationships'] = knowledge_course['count']
-            
-            return stats
+            return {
+                'profile_course_relationships': record['profile_course'],
+                'skill_course_relationships': record['skill_course'],
+                'knowledge_course_relationships': record['knowledge_course']
+            }
 
 
 def main():
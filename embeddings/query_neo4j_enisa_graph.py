@@ -5,8 +5,14 @@ This script provides common queries for exploring the ENISA skill set graph.
 """
 
 import argparse
+import functools
+import re
 import sys
-from typing import List, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
 try:
     from neo4j import GraphDatabase
@@ -16,201 +22,444 @@ except ImportError:
     print("WARNING: neo4j package not installed. Install with: pip install neo4j", file=sys.stderr)
 
 
+# Upper bound on queries run in parallel by main()
+MAX_QUERY_WORKERS = 8
+
+# Query result cache: entries kept, seconds before an entry is stale, and the minimum query time worth caching
+CACHE_SIZE = 256
+CACHE_TTL_SECONDS = 300
+CACHE_MIN_SECONDS = 0.01
+
+# Path-length bounds cannot be query parameters, so each allowed hop count has its own fixed query text
+_CAREER_PATH_QUERY = """
+    MATCH path = (start:Profile {title: $start_title})-[:SHARES_SKILLS_WITH*1..%d]-(related:Profile)
+    WHERE start <> related
+    RETURN 
+        start.title AS from_profile,
+        related.title AS to_profile,
+        length(path) AS steps,
+        [rel in relationships(path) | rel.count] AS shared_skills_counts
+    ORDER BY steps, shared_skills_counts DESC
+    LIMIT 20
+"""
+CAREER_PATH_QUERIES = {hops: _CAREER_PATH_QUERY % hops for hops in (1, 2, 3)}
+
+
+def cached_query(method):
+    """Memoize a read method per (name, args) in the querier's LRU cache (the session argument is not part of the key).
+    
+    Only results that took at least CACHE_MIN_SECONDS to fetch are stored; entries expire after CACHE_TTL_SECONDS.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, session=None, **kwargs):
+        if not self.use_cache:
+            return method(self, *args, session=session, **kwargs)
+        
+        # Lists (e.g. keyword batches) are keyed as tuples so they are hashable
+        key_args = tuple(tuple(a) if isinstance(a, list) else a for a in args)
+        key = (method.__name__, key_args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > now:
+                self._cache.move_to_end(key)
+                return entry[1]
+        
+        result = method(self, *args, session=session, **kwargs)
+        if time.monotonic() - now >= CACHE_MIN_SECONDS:
+            with self._cache_lock:
+                self._cache[key] = (now + CACHE_TTL_SECONDS, result)
+                self._cache.move_to_end(key)
+                if len(self._cache) > CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return result
+    return wrapper
+
+
+# Backing schema for the {title: ...} / {name: ...} lookups; names match create_neo4j_enisa_graph.py,
+# so IF NOT EXISTS makes these no-ops on a graph built by that script
+SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT profile_title_unique IF NOT EXISTS FOR (p:Profile) REQUIRE p.title IS UNIQUE",
+    "CREATE CONSTRAINT skill_name_unique IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE",
+    "CREATE CONSTRAINT knowledge_name_unique IF NOT EXISTS FOR (k:Knowledge) REQUIRE k.name IS UNIQUE",
+    "CREATE INDEX skill_profile_count_idx IF NOT EXISTS FOR (s:Skill) ON (s.profile_count)",
+    "CREATE INDEX knowledge_profile_count_idx IF NOT EXISTS FOR (k:Knowledge) ON (k.profile_count)",
+    # Lucene indexes behind the keyword searches
+    "CREATE FULLTEXT INDEX skill_name_ft IF NOT EXISTS FOR (s:Skill) ON EACH [s.name]",
+    "CREATE FULLTEXT INDEX knowledge_name_ft IF NOT EXISTS FOR (k:Knowledge) ON EACH [k.name]",
+]
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def fulltext_prefix_query(keyword: str) -> str:
+    """Turn a keyword into a Lucene query matching names containing all its words, the last one as a prefix.
+
+    The keyword is split into words the way the index analyzer tokenizes names, which also drops every
+    Lucene special character; a keyword without words gives an empty query (no matches).
+    """
+    terms = _WORD_RE.findall(keyword.lower())
+    if not terms:
+        return ""
+    return " AND ".join(terms[:-1] + [terms[-1] + "*"])
+
+
 class EnisaGraphQuerier:
     """Query the ENISA cybersecurity profiles Neo4j graph."""
     
-    def __init__(self, uri: str, user: str, password: str):
+    def __init__(self, uri: str, user: str, password: str, database: str = "neo4j",
+                 pool_size: int = 50, acquisition_timeout: float = 60.0, use_cache: bool = True):
         """Initialize Neo4j connection."""
         if not NEO4J_AVAILABLE:
             raise ImportError("neo4j package is required. Install with: pip install neo4j")
         
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+        self.driver = GraphDatabase.driver(
+            uri, auth=(user, password),
+            max_connection_pool_size=pool_size,
+            connection_acquisition_timeout=acquisition_timeout,
+            connection_timeout=30,
+            max_transaction_retry_time=15
+        )
+        # Fail fast on a bad URI or credentials instead of at the first query
+        self.driver.verify_connectivity()
+        self.database = database
+        self.pool_size = pool_size
+        self.use_cache = use_cache
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._has_apoc = True  # Cleared after the first call that finds APOC missing
+        # One session reused by all sequential queries; naming the database skips home-database resolution
+        self._session = self.driver.session(database=database)
+        self.ensure_indexes()
+    
+    def ensure_indexes(self):
+        """Create the constraints/indexes the lookup queries rely on, if missing (idempotent)."""
+        for statement in SCHEMA_STATEMENTS:
+            try:
+                self._session.run(statement).consume()
+            except Exception as e:
+                print(f"Note: Could not create index: {e}", file=sys.stderr)
+        try:
+            # Full-text indexes populate in the background; searches need them online
+            self._session.run("CALL db.awaitIndexes(300)").consume()
+        except Exception as e:
+            print(f"Note: Could not wait for indexes: {e}", file=sys.stderr)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _read(self, session, query: str, **params) -> List[Dict[str, Any]]:
+        """Run a read query in a managed transaction (retried on transient errors) on the given
+        session (from a worker thread) or on the shared one, and return its rows."""
+        return (session or self._session).execute_read(lambda tx: tx.run(query, **params).data())
+    
+    def prewarm(self, connections: int) -> None:
+        """Open up to `connections` pooled connections at once, so a parallel fan-out starts on live connections.
+        
+        Each thread holds its session until all have run `RETURN 1`; otherwise a finished thread's
+        connection would be reused by the next one and fewer connections would be opened.
+        """
+        connections = min(connections, self.pool_size)
+        if connections <= 1:
+            return
+        barrier = threading.Barrier(connections)
+        
+        def warm():
+            with self.driver.session(database=self.database) as session:
+                session.run("RETURN 1").consume()
+                try:
+                    barrier.wait(timeout=10)
+                except threading.BrokenBarrierError:
+                    pass
+        
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            for future in [executor.submit(warm) for _ in range(connections)]:
+                future.result()
+    
+    def run_concurrently(self, calls: List[Tuple[Callable, tuple]]) -> List[Any]:
+        """Run (method, args) query calls in parallel threads and return their results in call order.
+        
+        Sessions are not thread-safe, so each call gets its own session from the (thread-safe) driver;
+        the driver releases the GIL while waiting on Bolt I/O.
+        """
+        if len(calls) <= 1:
+            return [method(*args) for method, args in calls]
+        
+        def run(method, args):
+            with self.driver.session(database=self.database) as session:
+                return method(*args, session=session)
+        
+        with ThreadPoolExecutor(max_workers=min(len(calls), MAX_QUERY_WORKERS)) as executor:
+            futures = [executor.submit(run, method, args) for method, args in calls]
+            return [future.result() for future in futures]
     
     def close(self):
         """Close the Neo4j connection."""
+        if self._session:
+            self._session.close()
+            self._session = None
         if self.driver:
             self.driver.close()
     
-    def get_all_profiles(self) -> List[Dict[str, Any]]:
+    @cached_query
+    def get_all_profiles(self, session=None) -> List[Dict[str, Any]]:
         """Get all cybersecurity profiles."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (p:Profile)
-                RETURN p.profile_no AS no, p.title AS title, p.mission AS mission
-                ORDER BY p.profile_no
-            """)
-            return [dict(record) for record in result]
+        rows = self._read(session, """
+            MATCH (p:Profile)
+            RETURN p.profile_no AS no, p.title AS title, p.mission AS mission
+            ORDER BY p.profile_no
+        """)
+        return rows
     
-    def get_profile_details(self, profile_title: str) -> Dict[str, Any]:
+    @cached_query
+    def get_profile_details(self, profile_title: str, session=None) -> Dict[str, Any]:
         """Get detailed information about a specific profile."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (p:Profile {title: $title})
-                OPTIONAL MATCH (p)-[:HAS_SKILL]->(s:Skill)
-                OPTIONAL MATCH (p)-[:REQUIRES_KNOWLEDGE]->(k:Knowledge)
-                OPTIONAL MATCH (p)-[:PRODUCES_DELIVERABLE]->(d:Deliverable)
-                RETURN 
-                    p.profile_no AS no,
-                    p.title AS title,
-                    p.mission AS mission,
-                    p.main_tasks AS main_tasks,
-                    COLLECT(DISTINCT s.name) AS skills,
-                    COLLECT(DISTINCT k.name) AS knowledge,
-                    COLLECT(DISTINCT d.name) AS deliverables
-            """, title=profile_title)
-            
-            record = result.single()
-            if record:
-                return dict(record)
-            return None
+        rows = self._read(session, """
+            MATCH (p:Profile {title: $title})
+            // One subquery per relationship type: no skills x knowledge x deliverables row product to DISTINCT away
+            CALL { WITH p MATCH (p)-[:HAS_SKILL]->(s:Skill) RETURN COLLECT(s.name) AS skills }
+            CALL { WITH p MATCH (p)-[:REQUIRES_KNOWLEDGE]->(k:Knowledge) RETURN COLLECT(k.name) AS knowledge }
+            CALL { WITH p MATCH (p)-[:PRODUCES_DELIVERABLE]->(d:Deliverable) RETURN COLLECT(d.name) AS deliverables }
+            RETURN 
+                p.profile_no AS no,
+                p.title AS title,
+                p.mission AS mission,
+                p.main_tasks AS main_tasks,
+                skills,
+                knowledge,
+                deliverables
+        """, title=profile_title)
+        
+        return rows[0] if rows else None
     
-    def get_most_common_skills(self, limit: int = 10) -> List[Dict[str, Any]]:
+    @cached_query
+    def get_most_common_skills(self, limit: int = 10, session=None) -> List[Dict[str, Any]]:
         """Get the most commonly required skills across profiles."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (s:Skill)<-[:HAS_SKILL]-(p:Profile)
-                RETURN s.name AS skill, COUNT(p) AS profile_count
-                ORDER BY profile_count DESC
-                LIMIT $limit
-            """, limit=limit)
-            return [dict(record) for record in result]
+        # profile_count is precomputed by create_neo4j_enisa_graph.py; the range predicate lets the
+        # index serve the ORDER BY, so only `limit` nodes are read
+        rows = self._read(session, """
+            MATCH (s:Skill)
+            WHERE s.profile_count > 0
+            RETURN s.name AS skill, s.profile_count AS profile_count
+            ORDER BY profile_count DESC
+            LIMIT $limit
+        """, limit=limit)
+        if rows:
+            return rows
+        # Graph built before the counts were stored: aggregate the relationships instead
+        return self._read(session, """
+            MATCH (s:Skill)<-[:HAS_SKILL]-(p:Profile)
+            RETURN s.name AS skill, COUNT(p) AS profile_count
+            ORDER BY profile_count DESC
+            LIMIT $limit
+        """, limit=limit)
     
-    def get_most_common_knowledge(self, limit: int = 10) -> List[Dict[str, Any]]:
+    @cached_query
+    def get_most_common_knowledge(self, limit: int = 10, session=None) -> List[Dict[str, Any]]:
         """Get the most commonly required knowledge areas across profiles."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (k:Knowledge)<-[:REQUIRES_KNOWLEDGE]-(p:Profile)
-                RETURN k.name AS knowledge, COUNT(p) AS profile_count
-                ORDER BY profile_count DESC
-                LIMIT $limit
-            """, limit=limit)
-            return [dict(record) for record in result]
+        # profile_count is precomputed by create_neo4j_enisa_graph.py; the range predicate lets the
+        # index serve the ORDER BY, so only `limit` nodes are read
+        rows = self._read(session, """
+            MATCH (k:Knowledge)
+            WHERE k.profile_count > 0
+            RETURN k.name AS knowledge, k.profile_count AS profile_count
+            ORDER BY profile_count DESC
+            LIMIT $limit
+        """, limit=limit)
+        if rows:
+            return rows
+        # Graph built before the counts were stored: aggregate the relationships instead
+        return self._read(session, """
+            MATCH (k:Knowledge)<-[:REQUIRES_KNOWLEDGE]-(p:Profile)
+            RETURN k.name AS knowledge, COUNT(p) AS profile_count
+            ORDER BY profile_count DESC
+            LIMIT $limit
+        """, limit=limit)
     
-    def get_profiles_sharing_skills(self, min_shared: int = 2, limit: int = 20) -> List[Dict[str, Any]]:
+    @cached_query
+    def get_profiles_sharing_skills(self, min_shared: int = 2, limit: int = 20, session=None) -> List[Dict[str, Any]]:
         """Get profiles that share skills."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (p1:Profile)-[r:SHARES_SKILLS_WITH]->(p2:Profile)
-                WHERE r.count >= $min_shared
-                RETURN p1.title AS profile1, p2.title AS profile2, r.count AS shared_skills
-                ORDER BY r.count DESC
-                LIMIT $limit
-            """, min_shared=min_shared, limit=limit)
-            return [dict(record) for record in result]
+        rows = self._read(session, """
+            MATCH (p1:Profile)-[r:SHARES_SKILLS_WITH]->(p2:Profile)
+            WHERE r.count >= $min_shared
+            RETURN p1.title AS profile1, p2.title AS profile2, r.count AS shared_skills
+            ORDER BY r.count DESC
+            LIMIT $limit
+        """, min_shared=min_shared, limit=limit)
+        return rows
     
-    def get_profiles_sharing_knowledge(self, min_shared: int = 2, limit: int = 20) -> List[Dict[str, Any]]:
+    @cached_query
+    def get_profiles_sharing_knowledge(self, min_shared: int = 2, limit: int = 20, session=None) -> List[Dict[str, Any]]:
         """Get profiles that share knowledge areas."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (p1:Profile)-[r:SHARES_KNOWLEDGE_WITH]->(p2:Profile)
-                WHERE r.count >= $min_shared
-                RETURN p1.title AS profile1, p2.title AS profile2, r.count AS shared_knowledge
-                ORDER BY r.count DESC
-                LIMIT $limit
-            """, min_shared=min_shared, limit=limit)
-            return [dict(record) for record in result]
+        rows = self._read(session, """
+            MATCH (p1:Profile)-[r:SHARES_KNOWLEDGE_WITH]->(p2:Profile)
+            WHERE r.count >= $min_shared
+            RETURN p1.title AS profile1, p2.title AS profile2, r.count AS shared_knowledge
+            ORDER BY r.count DESC
+            LIMIT $limit
+        """, min_shared=min_shared, limit=limit)
+        return rows
+    
+    @cached_query
+    def find_profiles_by_skill(self, skill_keyword: str, session=None) -> List[Dict[str, Any]]:
+        """Find profiles that require a specific skill (case-insensitive word/prefix search on skill_name_ft)."""
+        lucene = fulltext_prefix_query(skill_keyword)
+        if not lucene:
+            return []
+        rows = self._read(session, """
+            CALL db.index.fulltext.queryNodes('skill_name_ft', $lucene) YIELD node AS s
+            MATCH (p:Profile)-[:HAS_SKILL]->(s)
+            RETURN p.title AS profile, s.name AS skill
+            ORDER BY p.profile_no
+        """, lucene=lucene)
+        return rows
+    
+    @cached_query
+    def find_profiles_by_knowledge(self, knowledge_keyword: str, session=None) -> List[Dict[str, Any]]:
+        """Find profiles that require specific knowledge (case-insensitive word/prefix search on knowledge_name_ft)."""
+        lucene = fulltext_prefix_query(knowledge_keyword)
+        if not lucene:
+            return []
+        rows = self._read(session, """
+            CALL db.index.fulltext.queryNodes('knowledge_name_ft', $lucene) YIELD node AS k
+            MATCH (p:Profile)-[:REQUIRES_KNOWLEDGE]->(k)
+            RETURN p.title AS profile, k.name AS knowledge
+            ORDER BY p.profile_no
+        """, lucene=lucene)
+        return rows
     
-    def find_profiles_by_skill(self, skill_keyword: str) -> List[Dict[str, Any]]:
-        """Find profiles that require a specific skill (case-insensitive search)."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (p:Profile)-[:HAS_SKILL]->(s:Skill)
-                WHERE toLower(s.name) CONTAINS toLower($keyword)
-                RETURN p.title AS profile, s.name AS skill
-                ORDER BY p.profile_no
-            """, keyword=skill_keyword)
-            return [dict(record) for record in result]
+    @cached_query
+    def find_profiles_by_skill_keywords(self, skill_keywords: List[str], session=None) -> Dict[str, List[Dict[str, Any]]]:
+        """Find profiles requiring each of several skill keywords in one query, grouped by keyword."""
+        rows = self._read(session, """
+            UNWIND $searches AS search
+            CALL db.index.fulltext.queryNodes('skill_name_ft', search.query) YIELD node AS s
+            MATCH (p:Profile)-[:HAS_SKILL]->(s)
+            RETURN search.keyword AS keyword, p.title AS profile, s.name AS skill
+            ORDER BY keyword, p.profile_no
+        """, searches=keyword_searches(skill_keywords))
+        return group_by_keyword(skill_keywords, rows)
     
-    def find_profiles_by_knowledge(self, knowledge_keyword: str) -> List[Dict[str, Any]]:
-        """Find profiles that require specific knowledge (case-insensitive search)."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (p:Profile)-[:REQUIRES_KNOWLEDGE]->(k:Knowledge)
-                WHERE toLower(k.name) CONTAINS toLower($keyword)
-                RETURN p.title AS profile, k.name AS knowledge
-                ORDER BY p.profile_no
-            """, keyword=knowledge_keyword)
-            return [dict(record) for record in result]
+    @cached_query
+    def find_profiles_by_knowledge_keywords(self, knowledge_keywords: List[str],
+                                            session=None) -> Dict[str, List[Dict[str, Any]]]:
+        """Find profiles requiring each of several knowledge keywords in one query, grouped by keyword."""
+        rows = self._read(session, """
+            UNWIND $searches AS search
+            CALL db.index.fulltext.queryNodes('knowledge_name_ft', search.query) YIELD node AS k
+            MATCH (p:Profile)-[:REQUIRES_KNOWLEDGE]->(k)
+            RETURN search.keyword AS keyword, p.title AS profile, k.name AS knowledge
+            ORDER BY keyword, p.profile_no
+        """, searches=keyword_searches(knowledge_keywords))
+        return group_by_keyword(knowledge_keywords, rows)
     
-    def get_skill_gap(self, current_profile: str, target_profile: str) -> List[Dict[str, Any]]:
+    @cached_query
+    def get_skill_gap(self, current_profile: str, target_profile: str, session=None) -> List[Dict[str, Any]]:
         """Get skills required by target profile but not in current profile."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (target:Profile {title: $target_title})-[:HAS_SKILL]->(s:Skill)
-                WHERE NOT EXISTS {
-                    MATCH (current:Profile {title: $current_title})-[:HAS_SKILL]->(s)
-                }
-                RETURN s.name AS skill_gap
-                ORDER BY s.name
-            """, current_title=current_profile, target_title=target_profile)
-            return [dict(record) for record in result]
+        rows = self._read(session, """
+            // Current profile is looked up once; the pattern predicate plans as an anti-semi-join
+            OPTIONAL MATCH (current:Profile {title: $current_title})
+            MATCH (target:Profile {title: $target_title})-[:HAS_SKILL]->(s:Skill)
+            WHERE current IS NULL OR NOT (current)-[:HAS_SKILL]->(s)
+            RETURN s.name AS skill_gap
+            ORDER BY s.name
+        """, current_title=current_profile, target_title=target_profile)
+        return rows
     
-    def get_knowledge_gap(self, current_profile: str, target_profile: str) -> List[Dict[str, Any]]:
+    @cached_query
+    def get_knowledge_gap(self, current_profile: str, target_profile: str, session=None) -> List[Dict[str, Any]]:
         """Get knowledge required by target profile but not in current profile."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (target:Profile {title: $target_title})-[:REQUIRES_KNOWLEDGE]->(k:Knowledge)
-                WHERE NOT EXISTS {
-                    MATCH (current:Profile {title: $current_title})-[:REQUIRES_KNOWLEDGE]->(k)
-                }
-                RETURN k.name AS knowledge_gap
-                ORDER BY k.name
-            """, current_title=current_profile, target_title=target_profile)
-            return [dict(record) for record in result]
+        rows = self._read(session, """
+            // Current profile is looked up once; the pattern predicate plans as an anti-semi-join
+            OPTIONAL MATCH (current:Profile {title: $current_title})
+            MATCH (target:Profile {title: $target_title})-[:REQUIRES_KNOWLEDGE]->(k:Knowledge)
+            WHERE current IS NULL OR NOT (current)-[:REQUIRES_KNOWLEDGE]->(k)
+            RETURN k.name AS knowledge_gap
+            ORDER BY k.name
+        """, current_title=current_profile, target_title=target_profile)
+        return rows
     
-    def get_career_paths(self, start_profile: str, max_hops: int = 2) -> List[Dict[str, Any]]:
-        """Find potential career progression paths from a starting profile."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH path = (start:Profile {title: $start_title})-[:SHARES_SKILLS_WITH*1..$max_hops]-(related:Profile)
-                WHERE start <> related
-                RETURN 
-                    start.title AS from_profile,
-                    related.title AS to_profile,
-                    length(path) AS steps,
-                    [rel in relationships(path) | rel.count] AS shared_skills_counts
-                ORDER BY steps, shared_skills_counts DESC
-                LIMIT 20
-            """, start_title=start_profile, max_hops=max_hops)
-            return [dict(record) for record in result]
+    @cached_query
+    def get_career_paths(self, start_profile: str, max_hops: int = 2, session=None) -> List[Dict[str, Any]]:
+        """Find potential career progression paths from a starting profile (max_hops 1-3)."""
+        if max_hops not in CAREER_PATH_QUERIES:
+            raise ValueError(f"max_hops must be one of {sorted(CAREER_PATH_QUERIES)}, got {max_hops}")
+        rows = self._read(session, CAREER_PATH_QUERIES[max_hops], start_title=start_profile)
+        return rows
     
-    def get_graph_statistics(self) -> Dict[str, Any]:
-        """Get overall graph statistics."""
-        with self.driver.session() as session:
-            # Count nodes by type
-            node_counts = session.run("""
+    @cached_query
+    def get_graph_statistics(self, session=None) -> Dict[str, Any]:
+        """Get overall graph statistics (node counts by label, relationship counts by type) in one query."""
+        if self._has_apoc:
+            try:
+                # Served from the count store, no graph scan
+                record = self._read(session, """
+                    CALL apoc.meta.stats() YIELD labels, relTypesCount
+                    RETURN labels, relTypesCount
+                """)[0]
+                return {
+                    'nodes': [{'node_type': label, 'count': count}
+                              for label, count in sorted(record['labels'].items(), key=lambda x: -x[1])],
+                    'relationships': [{'relationship_type': rel_type, 'count': count}
+                                      for rel_type, count in sorted(record['relTypesCount'].items(), key=lambda x: -x[1])]
+                }
+            except Exception as e:
+                if "apoc" not in str(e).lower():
+                    raise
+                self._has_apoc = False
+        
+        return self._read(session, """
+            CALL {
                 MATCH (n)
-                RETURN labels(n)[0] AS node_type, COUNT(n) AS count
+                WITH labels(n)[0] AS node_type, COUNT(n) AS count
                 ORDER BY count DESC
-            """)
-            
-            # Count relationships by type
-            rel_counts = session.run("""
+                RETURN collect({node_type: node_type, count: count}) AS nodes
+            }
+            CALL {
                 MATCH ()-[r]->()
-                RETURN type(r) AS relationship_type, COUNT(r) AS count
+                WITH type(r) AS relationship_type, COUNT(r) AS count
                 ORDER BY count DESC
-            """)
-            
-            return {
-                'nodes': [dict(record) for record in node_counts],
-                'relationships': [dict(record) for record in rel_counts]
+                RETURN collect({relationship_type: relationship_type, count: count}) AS relationships
             }
+            RETURN nodes, relationships
+        """)[0]
+
+def keyword_searches(keywords: List[str]) -> List[Dict[str, str]]:
+    """Build {keyword, query} maps for a batched full-text search (duplicate and empty keywords dropped)."""
+    searches = ((keyword, fulltext_prefix_query(keyword)) for keyword in dict.fromkeys(keywords))
+    return [{'keyword': keyword, 'query': query} for keyword, query in searches if query]
+
+
+def group_by_keyword(keywords: List[str], rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Split rows of a batched keyword search into {keyword: rows}, in the order the keywords were given."""
+    grouped = {keyword: [] for keyword in keywords}
+    for row in rows:
+        grouped[row.pop('keyword')].append(row)
+    return grouped
 
 
 def print_results(results: Any, title: str = None):
-    """Pretty print query results."""
+    """Pretty print query results; lists and other iterables (e.g. generators) are consumed row by row."""
     if title:
         print(f"\n{'=' * 80}")
         print(f"{title}")
         print('=' * 80)
     
-    if isinstance(results, list):
-        if not results:
-            print("No results found.")
-            return
-        
-        for i, result in enumerate(results, 1):
-            print(f"\n{i}. ", end="")
+    if isinstance(results, dict):
+        for key, value in results.items():
+            print(f"\n{key}:")
+            if isinstance(value, list):
+                for item in value:
+                    print(f"  {item}")
+            else:
+                print(f"  {value}")
+    elif isinstance(results, Iterable) and not isinstance(results, str):
+        count = 0
+        for count, result in enumerate(results, 1):
+            print(f"\n{count}. ", end="")
             if isinstance(result, dict):
                 for key, value in result.items():
                     if isinstance(value, list):
@@ -222,14 +471,9 @@ def print_results(results: Any, title: str = None):
                         print(f"\n   {key}: {value}", end="")
             else:
                 print(result)
-    elif isinstance(results, dict):
-        for key, value in results.items():
-            print(f"\n{key}:")
-            if isinstance(value, list):
-                for item in value:
-                    print(f"  {item}")
-            else:
-                print(f"  {value}")
+        if not count:
+            print("No results found.")
+            return
     else:
         print(results)
     
@@ -244,6 +488,14 @@ def main():
                        help="Neo4j username.")
     parser.add_argument("--password", "-p", type=str, required=True,
                        help="Neo4j password.")
+    parser.add_argument("--database", type=str, default="neo4j",
+                       help="Neo4j database name.")
+    parser.add_argument("--pool-size", type=int, default=50,
+                       help="Maximum connections in the driver's pool.")
+    parser.add_argument("--acq-timeout", type=float, default=60.0,
+                       help="Seconds to wait for a pooled connection before failing.")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Bypass the in-process query result cache.")
     
     # Query options
     parser.add_argument("--list-profiles", action="store_true",
@@ -258,16 +510,18 @@ def main():
                        help="Get profiles sharing at least MIN skills.")
     parser.add_argument("--shared-knowledge", type=int, metavar="MIN",
                        help="Get profiles sharing at least MIN knowledge areas.")
-    parser.add_argument("--find-skill", type=str, metavar="KEYWORD",
-                       help="Find profiles requiring a specific skill.")
-    parser.add_argument("--find-knowledge", type=str, metavar="KEYWORD",
-                       help="Find profiles requiring specific knowledge.")
+    parser.add_argument("--find-skill", type=str, nargs="+", metavar="KEYWORD",
+                       help="Find profiles requiring a specific skill (several keywords are searched in one query).")
+    parser.add_argument("--find-knowledge", type=str, nargs="+", metavar="KEYWORD",
+                       help="Find profiles requiring specific knowledge (several keywords are searched in one query).")
     parser.add_argument("--skill-gap", nargs=2, metavar=("CURRENT", "TARGET"),
                        help="Get skill gap between current and target profile.")
     parser.add_argument("--knowledge-gap", nargs=2, metavar=("CURRENT", "TARGET"),
                        help="Get knowledge gap between current and target profile.")
     parser.add_argument("--career-paths", type=str, metavar="PROFILE",
                        help="Find career progression paths from a profile.")
+    parser.add_argument("--max-hops", type=int, default=2, choices=sorted(CAREER_PATH_QUERIES),
+                       help="Maximum SHARES_SKILLS_WITH hops for --career-paths.")
     parser.add_argument("--statistics", action="store_true",
                        help="Get graph statistics.")
     
@@ -285,64 +539,57 @@ def main():
     
     # Initialize querier
     print(f"Connecting to Neo4j at {args.uri}...", file=sys.stderr)
-    querier = EnisaGraphQuerier(args.uri, args.user, args.password)
-    
-    try:
+    with EnisaGraphQuerier(args.uri, args.user, args.password, args.database,
+                           args.pool_size, args.acq_timeout, not args.no_cache) as querier:
+        # Selected queries are independent: run them concurrently, then print in option order
+        tasks = []
         if args.list_profiles:
-            results = querier.get_all_profiles()
-            print_results(results, "All Cybersecurity Profiles")
-        
+            tasks.append(("All Cybersecurity Profiles", querier.get_all_profiles, ()))
         if args.profile:
-            results = querier.get_profile_details(args.profile)
-            if results:
-                print_results([results], f"Profile Details: {args.profile}")
-            else:
-                print(f"Profile not found: {args.profile}", file=sys.stderr)
-        
+            tasks.append((f"Profile Details: {args.profile}", querier.get_profile_details, (args.profile,)))
         if args.top_skills:
-            results = querier.get_most_common_skills(args.top_skills)
-            print_results(results, f"Top {args.top_skills} Most Common Skills")
-        
+            tasks.append((f"Top {args.top_skills} Most Common Skills",
+                          querier.get_most_common_skills, (args.top_skills,)))
         if args.top_knowledge:
-            results = querier.get_most_common_knowledge(args.top_knowledge)
-            print_results(results, f"Top {args.top_knowledge} Most Common Knowledge Areas")
-        
+            tasks.append((f"Top {args.top_knowledge} Most Common Knowledge Areas",
+                          querier.get_most_common_knowledge, (args.top_knowledge,)))
         if args.shared_skills:
-            results = querier.get_profiles_sharing_skills(args.shared_skills)
-            print_results(results, f"Profiles Sharing At Least {args.shared_skills} Skills")
-        
+            tasks.append((f"Profiles Sharing At Least {args.shared_skills} Skills",
+                          querier.get_profiles_sharing_skills, (args.shared_skills,)))
         if args.shared_knowledge:
-            results = querier.get_profiles_sharing_knowledge(args.shared_knowledge)
-            print_results(results, f"Profiles Sharing At Least {args.shared_knowledge} Knowledge Areas")
-        
+            tasks.append((f"Profiles Sharing At Least {args.shared_knowledge} Knowledge Areas",
+                          querier.get_profiles_sharing_knowledge, (args.shared_knowledge,)))
         if args.find_skill:
-            results = querier.find_profiles_by_skill(args.find_skill)
-            print_results(results, f"Profiles Requiring Skill: {args.find_skill}")
-        
+            tasks.append(("Profiles Requiring Skill",
+                          querier.find_profiles_by_skill_keywords, (args.find_skill,)))
         if args.find_knowledge:
-            results = querier.find_profiles_by_knowledge(args.find_knowledge)
-            print_results(results, f"Profiles Requiring Knowledge: {args.find_knowledge}")
-        
+            tasks.append(("Profiles Requiring Knowledge",
+                          querier.find_profiles_by_knowledge_keywords, (args.find_knowledge,)))
         if args.skill_gap:
             current, target = args.skill_gap
-            results = querier.get_skill_gap(current, target)
-            print_results(results, f"Skill Gap: {current} → {target}")
-        
+            tasks.append((f"Skill Gap: {current} → {target}", querier.get_skill_gap, (current, target)))
         if args.knowledge_gap:
             current, target = args.knowledge_gap
-            results = querier.get_knowledge_gap(current, target)
-            print_results(results, f"Knowledge Gap: {current} → {target}")
-        
+            tasks.append((f"Knowledge Gap: {current} → {target}", querier.get_knowledge_gap, (current, target)))
         if args.career_paths:
-            results = querier.get_career_paths(args.career_paths)
-            print_results(results, f"Career Paths from: {args.career_paths}")
-        
+            tasks.append((f"Career Paths from: {args.career_paths}",
+                          querier.get_career_paths, (args.career_paths, args.max_hops)))
         if args.statistics:
-            results = querier.get_graph_statistics()
-            print_results(results, "Graph Statistics")
-    
-    finally:
-        querier.close()
+            tasks.append(("Graph Statistics", querier.get_graph_statistics, ()))
+        
+        querier.prewarm(min(len(tasks), MAX_QUERY_WORKERS))
+        all_results = querier.run_concurrently([(method, call_args) for _, method, call_args in tasks])
+        for (title, method, _), results in zip(tasks, all_results):
+            if method == querier.get_profile_details:
+                if results:
+                    print_results([results], title)
+                else:
+                    print(f"Profile not found: {args.profile}", file=sys.stderr)
+            elif method in (querier.find_profiles_by_skill_keywords, querier.find_profiles_by_knowledge_keywords):
+                for keyword, rows in results.items():
+                    print_results(rows, f"{title}: {keyword}")
+            else:
+                print_results(results, title)
 
 
 if __name__ == "__main__":
@@ -6,136 +6,264 @@ This script demonstrates common queries you can perform on the course graph.
 
 from neo4j import GraphDatabase
 import argparse
+import sys
 from typing import List, Dict
 
 
+# Path-length bounds cannot be query parameters, so each allowed depth has its own fixed query text
+# (one cached plan per depth instead of a new one per f-string)
+_LEARNING_PATH_QUERY = """
+    MATCH path = (start:Course {title: $start})-[:SIMILAR_TO*1..%d]->(end:Course)
+    WHERE start <> end AND ALL(r in relationships(path) WHERE r.similarity > 0.5)
+    WITH path, 
+         [node in nodes(path) | node.title] as course_titles,
+         reduce(sim = 1.0, rel in relationships(path) | sim * rel.similarity) as path_strength
+    RETURN course_titles, length(path) as steps, path_strength
+    ORDER BY path_strength DESC
+    LIMIT $limit
+"""
+LEARNING_PATH_QUERIES = {depth: _LEARNING_PATH_QUERY % depth for depth in (1, 2, 3)}
+
+# In-memory GDS projection of SIMILAR_TO links above 0.5, weighted by -log(similarity) so the cheapest
+# path is the one with the highest similarity product (isolated courses are kept as sources)
+GDS_GRAPH_NAME = "course_similarity"
+_GDS_PROJECT_QUERY = """
+    MATCH (source:Course)
+    OPTIONAL MATCH (source)-[r:SIMILAR_TO]->(target:Course)
+    WHERE r.similarity > 0.5
+    WITH gds.graph.project($graph, source, target, {
+        relationshipProperties: CASE WHEN r IS NULL THEN null ELSE {cost: -log(r.similarity)} END
+    }) AS g
+    RETURN g.graphName AS graph
+"""
+_GDS_LEARNING_PATH_QUERY = """
+    MATCH (start:Course {title: $start})
+    CALL gds.allShortestPaths.dijkstra.stream($graph, {sourceNode: start, relationshipWeightProperty: 'cost'})
+    YIELD nodeIds, totalCost
+    WITH nodeIds, totalCost, size(nodeIds) - 1 AS steps
+    WHERE steps >= 1 AND steps <= $max_depth
+    RETURN [node_id IN nodeIds | gds.util.asNode(node_id).title] AS course_titles,
+           steps,
+           exp(-totalCost) AS path_strength
+    ORDER BY path_strength DESC
+    LIMIT $limit
+"""
+
+# Backing schema for the {title: ...} / course_id lookups; names match create_neo4j_graph.py,
+# so IF NOT EXISTS makes these no-ops on a graph built by that script
+SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT course_id_unique IF NOT EXISTS FOR (c:Course) REQUIRE c.course_id IS UNIQUE",
+    "CREATE CONSTRAINT skill_name_unique IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE",
+    "CREATE INDEX course_title_idx IF NOT EXISTS FOR (c:Course) ON (c.title)",
+]
+
+
 class CourseGraphQuery:
     """Helper class for querying the course knowledge graph."""
     
-    def __init__(self, uri: str, user: str, password: str):
+    def __init__(self, uri: str, user: str, password: str, database: str = "neo4j",
+                 pool_size: int = 50, acquisition_timeout: float = 60.0):
         """Initialize connection to Neo4j."""
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+        self.driver = GraphDatabase.driver(
+            uri, auth=(user, password),
+            max_connection_pool_size=pool_size,
+            connection_acquisition_timeout=acquisition_timeout,
+            connection_timeout=30,
+            max_transaction_retry_time=15
+        )
+        # Fail fast on a bad URI or credentials instead of at the first query
+        self.driver.verify_connectivity()
+        # One session reused by all sequential queries; naming the database skips home-database resolution
+        self._session = self.driver.session(database=database)
+        self._has_gds = True  # Cleared after the first call that finds GDS missing
+        self._projected = False
+        self._shared_skills_threshold = None  # Set on first use; stays None when no edges are materialized
+        self._checked_shared_edges = False
+        self.ensure_indexes()
+    
+    def ensure_indexes(self):
+        """Create the constraints/indexes the lookup queries rely on, if missing (idempotent)."""
+        for statement in SCHEMA_STATEMENTS:
+            try:
+                self._session.run(statement).consume()
+            except Exception as e:
+                print(f"Note: Could not create index: {e}", file=sys.stderr)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
     
     def close(self):
         """Close the database connection."""
+        if self._session:
+            self._session.close()
+            self._session = None
         if self.driver:
             self.driver.close()
     
+    def _read(self, query: str, **params) -> List[Dict]:
+        """Run a read query in a managed transaction (retried on transient errors) and return its rows."""
+        return self._session.execute_read(lambda tx: tx.run(query, **params).data())
+    
     def get_all_courses(self, limit: int = 10) -> List[Dict]:
         """Get all courses in the database."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (c:Course)
-                RETURN c.course_id as id, c.title as title
-                ORDER BY c.course_id
-                LIMIT $limit
-            """, limit=limit)
-            return [dict(record) for record in result]
+        rows = self._read("""
+            MATCH (c:Course)
+            RETURN c.course_id as id, c.title as title
+            ORDER BY c.course_id
+            LIMIT $limit
+        """, limit=limit)
+        return rows
     
     def find_similar_courses(self, course_title: str, limit: int = 5) -> List[Dict]:
         """Find courses similar to a given course."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (c:Course {title: $title})-[r:SIMILAR_TO]->(similar:Course)
-                RETURN similar.title as title, 
-                       similar.description as description,
-                       r.similarity as similarity
-                ORDER BY r.similarity DESC
-                LIMIT $limit
-            """, title=course_title, limit=limit)
-            return [dict(record) for record in result]
+        rows = self._read("""
+            MATCH (c:Course {title: $title})-[r:SIMILAR_TO]->(similar:Course)
+            RETURN similar.title as title, 
+                   similar.description as description,
+                   r.similarity as similarity
+            ORDER BY r.similarity DESC
+            LIMIT $limit
+        """, title=course_title, limit=limit)
+        return rows
     
     def find_courses_by_skill(self, skill_name: str) -> List[Dict]:
         """Find all courses that teach a specific skill."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (c:Course)-[:HAS_SKILL]->(s:Skill)
-                WHERE toLower(s.name) = toLower($skill)
-                RETURN c.title as title, c.description as description
-            """, skill=skill_name)
-            return [dict(record) for record in result]
+        rows = self._read("""
+            MATCH (c:Course)-[:HAS_SKILL]->(s:Skill)
+            WHERE toLower(s.name) = toLower($skill)
+            RETURN c.title as title, c.description as description
+        """, skill=skill_name)
+        return rows
     
     def get_course_skills(self, course_title: str) -> List[str]:
         """Get all skills for a given course."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (c:Course {title: $title})-[:HAS_SKILL]->(s:Skill)
-                RETURN s.name as skill
-                ORDER BY s.name
-            """, title=course_title)
-            return [record["skill"] for record in result]
+        rows = self._read("""
+            MATCH (c:Course {title: $title})-[:HAS_SKILL]->(s:Skill)
+            RETURN s.name as skill
+            ORDER BY s.name
+        """, title=course_title)
+        return [row["skill"] for row in rows]
     
     def find_courses_with_shared_skills(self, course_title: str, min_shared: int = 2) -> List[Dict]:
-        """Find courses that share skills with a given course."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (c1:Course {title: $title})-[:HAS_SKILL]->(s:Skill)<-[:HAS_SKILL]-(c2:Course)
-                WHERE c1 <> c2
-                WITH c2, collect(DISTINCT s.name) as shared_skills
-                WHERE size(shared_skills) >= $min_shared
-                RETURN c2.title as title, shared_skills, size(shared_skills) as count
+        """Find courses that share skills with a given course.
+
+        Reads the SHARES_SKILLS_WITH counts precomputed by create_neo4j_graph.py, which only link
+        courses sharing at least --shared-skills-threshold skills (default 2); below that threshold, or
+        on a graph without those edges, the HAS_SKILL relationships are aggregated instead.
+        """
+        if not self._checked_shared_edges:
+            # Highest threshold the edges were built with: every pair sharing at least that many skills has one
+            rows = self._read("MATCH ()-[r:SHARES_SKILLS_WITH]->() RETURN max(r.threshold) AS threshold")
+            self._shared_skills_threshold = rows[0]["threshold"] if rows else None
+            self._checked_shared_edges = True
+        threshold = self._shared_skills_threshold
+        if threshold is not None and threshold <= min_shared:
+            return self._read("""
+                MATCH (c1:Course {title: $title})-[r:SHARES_SKILLS_WITH]-(c2:Course)
+                WHERE r.count >= $min_shared
+                RETURN c2.title as title, r.count as count
                 ORDER BY count DESC
             """, title=course_title, min_shared=min_shared)
-            return [dict(record) for record in result]
+        # Graph built before the edges were materialized, or min_shared below the builder's
+        # threshold (edges missing for smaller counts): aggregate the relationships instead
+        return self._read("""
+            MATCH (c1:Course {title: $title})-[:HAS_SKILL]->(s:Skill)<-[:HAS_SKILL]-(c2:Course)
+            WHERE c1 <> c2
+            WITH c2, count(DISTINCT s) as count
+            WHERE count >= $min_shared
+            RETURN c2.title as title, count
+            ORDER BY count DESC
+        """, title=course_title, min_shared=min_shared)
     
     def get_most_common_skills(self, limit: int = 10) -> List[Dict]:
         """Get the most commonly taught skills."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (s:Skill)<-[:HAS_SKILL]-(c:Course)
-                RETURN s.name as skill, count(c) as course_count
-                ORDER BY course_count DESC
-                LIMIT $limit
-            """, limit=limit)
-            return [dict(record) for record in result]
+        rows = self._read("""
+            MATCH (s:Skill)<-[:HAS_SKILL]-(c:Course)
+            RETURN s.name as skill, count(c) as course_count
+            ORDER BY course_count DESC
+            LIMIT $limit
+        """, limit=limit)
+        return rows
     
     def recommend_courses(self, course_title: str, limit: int = 5) -> List[Dict]:
         """Recommend courses based on similarity and shared skills."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (source:Course {title: $title})
-                MATCH (source)-[sim:SIMILAR_TO]->(target:Course)
-                OPTIONAL MATCH (source)-[:HAS_SKILL]->(skill:Skill)<-[:HAS_SKILL]-(target)
-                WITH target, sim.similarity as similarity, count(DISTINCT skill) as shared_skills
-                RETURN target.title as title,
-                       target.description as description,
-                       similarity,
-                       shared_skills,
-                       (similarity * 0.7 + (shared_skills * 0.1)) as score
-                ORDER BY score DESC
-                LIMIT $limit
-            """, title=course_title, limit=limit)
-            return [dict(record) for record in result]
+        rows = self._read("""
+            MATCH (source:Course {title: $title})
+            MATCH (source)-[sim:SIMILAR_TO]->(target:Course)
+            OPTIONAL MATCH (source)-[:HAS_SKILL]->(skill:Skill)<-[:HAS_SKILL]-(target)
+            WITH target, sim.similarity as similarity, count(DISTINCT skill) as shared_skills
+            RETURN target.title as title,
+                   target.description as description,
+                   similarity,
+                   shared_skills,
+                   (similarity * 0.7 + (shared_skills * 0.1)) as score
+            ORDER BY score DESC
+            LIMIT $limit
+        """, title=course_title, limit=limit)
+        return rows
+    
+    def refresh_projection(self) -> None:
+        """(Re)build the GDS similarity projection; call after the SIMILAR_TO links change. No-op without GDS."""
+        try:
+            self._session.run("CALL gds.graph.drop($graph, false)", graph=GDS_GRAPH_NAME).consume()
+            self._session.run(_GDS_PROJECT_QUERY, graph=GDS_GRAPH_NAME).consume()
+        except Exception as e:
+            if "gds." not in str(e).lower():
+                raise
+            print("Note: GDS not available; learning paths are enumerated in Cypher, nothing to refresh.", file=sys.stderr)
+            self._has_gds = False
+            return
+        self._projected = True
+    
+    def _ensure_projection(self) -> None:
+        """Project the similarity graph once; an existing projection (e.g. from an earlier run) is reused.
+
+        create_neo4j_graph.py drops the projection after every import, so a reused one matches the graph.
+        """
+        if self._projected:
+            return
+        exists = self._read("CALL gds.graph.exists($graph) YIELD exists RETURN exists", graph=GDS_GRAPH_NAME)
+        if not exists[0]["exists"]:
+            self._session.run(_GDS_PROJECT_QUERY, graph=GDS_GRAPH_NAME).consume()
+        self._projected = True
     
     def find_learning_paths(self, start_course: str, max_depth: int = 3, limit: int = 5) -> List[Dict]:
-        """Find learning paths starting from a course."""
-        with self.driver.session() as session:
-            result = session.run(f"""
-                MATCH path = (start:Course {{title: $start}})-[:SIMILAR_TO*1..{max_depth}]->(end:Course)
-                WHERE start <> end AND ALL(r in relationships(path) WHERE r.similarity > 0.5)
-                WITH path, 
-                     [node in nodes(path) | node.title] as course_titles,
-                     reduce(sim = 1.0, rel in relationships(path) | sim * rel.similarity) as path_strength
-                RETURN course_titles, length(path) as steps, path_strength
-                ORDER BY path_strength DESC
-                LIMIT $limit
-            """, start=start_course, limit=limit)
-            return [dict(record) for record in result]
+        """Find learning paths starting from a course (max_depth 1-3).
+        
+        With GDS, Dijkstra returns the strongest path to each reachable course (kept when it has at most
+        max_depth steps); without it, every path up to max_depth is enumerated in Cypher.
+        """
+        if max_depth not in LEARNING_PATH_QUERIES:
+            raise ValueError(f"max_depth must be one of {sorted(LEARNING_PATH_QUERIES)}, got {max_depth}")
+        if self._has_gds:
+            try:
+                self._ensure_projection()
+                return self._read(_GDS_LEARNING_PATH_QUERY, graph=GDS_GRAPH_NAME,
+                                  start=start_course, max_depth=max_depth, limit=limit)
+            except Exception as e:
+                if "gds." not in str(e).lower():
+                    raise
+                print("Note: GDS not available; enumerating learning paths in Cypher.", file=sys.stderr)
+                self._has_gds = False
+        rows = self._read(LEARNING_PATH_QUERIES[max_depth], start=start_course, limit=limit)
+        return rows
     
     def get_database_stats(self) -> Dict:
         """Get statistics about the graph database."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (c:Course)
-                OPTIONAL MATCH (s:Skill)
-                OPTIONAL MATCH ()-[r:HAS_SKILL]->()
-                OPTIONAL MATCH ()-[sim:SIMILAR_TO]->()
-                RETURN count(DISTINCT c) as course_count,
-                       count(DISTINCT s) as skill_count,
-                       count(DISTINCT r) as has_skill_count,
-                       count(DISTINCT sim) as similarity_count
-            """)
-            return dict(result.single())
+        rows = self._read("""
+            MATCH (c:Course)
+            OPTIONAL MATCH (s:Skill)
+            OPTIONAL MATCH ()-[r:HAS_SKILL]->()
+            OPTIONAL MATCH ()-[sim:SIMILAR_TO]->()
+            RETURN count(DISTINCT c) as course_count,
+                   count(DISTINCT s) as skill_count,
+                   count(DISTINCT r) as has_skill_count,
+                   count(DISTINCT sim) as similarity_count
+        """)
+        return rows[0]
 
 
 def main():
@@ -143,15 +271,23 @@ def main():
     parser.add_argument("--uri", type=str, default="bolt://localhost:7687", help="Neo4j URI")
     parser.add_argument("--user", type=str, default="neo4j", help="Neo4j username")
     parser.add_argument("--password", "-p", type=str, required=True, help="Neo4j password")
+    parser.add_argument("--database", type=str, default="neo4j", help="Neo4j database name")
+    parser.add_argument("--pool-size", type=int, default=50, help="Maximum connections in the driver's pool")
+    parser.add_argument("--acq-timeout", type=float, default=60.0,
+                        help="Seconds to wait for a pooled connection before failing")
     parser.add_argument("--course", type=str, help="Course title for queries")
+    parser.add_argument("--refresh-projection", action="store_true",
+                        help="Rebuild the GDS similarity projection used for learning paths (after the graph changed)")
     
     args = parser.parse_args()
     
     # Initialize query interface
     print("Connecting to Neo4j...\n")
-    query = CourseGraphQuery(args.uri, args.user, args.password)
-    
-    try:
+    with CourseGraphQuery(args.uri, args.user, args.password, args.database,
+                          args.pool_size, args.acq_timeout) as query:
+        if args.refresh_projection:
+            query.refresh_projection()
+        
         # Get database statistics
         print("=" * 60)
         print("DATABASE STATISTICS")
@@ -235,9 +371,7 @@ def main():
             for idx, course in enumerate(courses, 1):
                 print(f"{idx}. {course['title']}")
     
-    finally:
-        query.close()
-        print("\nConnection closed.")
+    print("\nConnection closed.")
 
 
 if __name__ == "__main__":
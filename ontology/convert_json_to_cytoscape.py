@@ -1,47 +1,97 @@
 import json
+import sys
 
-with open("ontology.json") as f:
-    data = json.load(f)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
-graph = data["graphs"][0]
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+INPUT_PATH = "ontology.json"
+OUTPUT_PATH = "cytoscape_ontology.json"
+
+
+def iter_graph_items(path, key):
+    """Yield the items of graph[key] for every graph in the ontology file.
+
+    With ijson the file is stream-parsed, so only one item is in memory at a time;
+    otherwise it falls back to json.load.
+    """
+    if IJSON_AVAILABLE:
+        with open(path, "rb") as f:
+            yield from ijson.items(f, f"graphs.item.{key}.item", use_float=True)
+    else:
+        with open(path) as f:
+            data = json.load(f)
+        for graph in data["graphs"]:
+            yield from graph[key]
 
-nodes_out = []
-edges_out = []
 
 # 1. Convert nodes
-for n in graph["nodes"]:
-    nodes_out.append({
-        "data": {
-            "id": n["id"],
-            "label": n["id"].split("#")[-1],
-            "type": n["type"],
-            "propertyType": n.get("propertyType", None)
+def iter_nodes(nodes):
+    for n in nodes:
+        yield {
+            "data": {
+                "id": n["id"],
+                "label": n["id"].split("#")[-1],
+                "type": sys.intern(n["type"]),
+                "propertyType": n.get("propertyType", None)
+            }
         }
-    })
+
 
 # 2. Convert domain-range axioms to edges
-for ax in graph["domainRangeAxioms"]:
-    predicate = ax["predicateId"]
-    domains = ax["domainClassIds"]
-    ranges = ax["rangeClassIds"]
-
-    for d in domains:
-        for r in ranges:
-            edges_out.append({
-                "data": {
-                    "id": predicate + "_edge",
-                    "source": d,
-                    "target": r,
-                    "label": predicate.split("#")[-1]
+def iter_edges(axioms):
+    """Yield one edge per distinct (predicate, domain, range), with ids unique as Cytoscape requires."""
+    seen = set()
+    for ax in axioms:
+        predicate = ax["predicateId"]
+        label = sys.intern(predicate.split("#")[-1])
+        # Class ids repeat across axioms; interning lets every edge share one copy of each
+        ranges = [sys.intern(r) for r in ax["rangeClassIds"]]
+        for d in map(sys.intern, ax["domainClassIds"]):
+            for r in ranges:
+                eid = f"{predicate}|{d}|{r}"
+                if eid in seen:
+                    continue
+                seen.add(eid)
+                yield {
+                    "data": {
+                        "id": eid,
+                        "source": d,
+                        "target": r,
+                        "label": label
+                    }
                 }
-            })
 
-output = {
-    "elements": {
-        "nodes": nodes_out,
-        "edges": edges_out
-    }
-}
 
-with open("cytoscape_ontology.json", "w") as f:
-    json.dump(output, f, indent=2)
+def dumps(item):
+    """Encode item as compact JSON bytes (orjson when installed, else stdlib json)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(item)
+    return json.dumps(item, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def write_array(f, items):
+    """Write items as a compact JSON array, one element at a time."""
+    f.write(b"[")
+    for i, item in enumerate(items):
+        if i:
+            f.write(b",")
+        f.write(dumps(item))
+    f.write(b"]")
+
+
+# Output is written incrementally (no nodes/edges lists are built) and compactly
+with open(OUTPUT_PATH, "wb") as f:
+    f.write(b'{"elements":{"nodes":')
+    write_array(f, iter_nodes(iter_graph_items(INPUT_PATH, "nodes")))
+    f.write(b',"edges":')
+    write_array(f, iter_edges(iter_graph_items(INPUT_PATH, "domainRangeAxioms")))
+    f.write(b"}}")
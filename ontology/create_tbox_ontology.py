@@ -1,28 +1,71 @@
-import xml.dom.minidom as minidom
-import os
+import argparse
 import pathlib
-from xml.etree.ElementTree import Element, SubElement, tostring
+from lxml.etree import Element, SubElement, tostring
 
-# Generates TBox ontology for the courses dataset schema
-def generate_tbox(output_path="tbox.owl"):
-    rdf = Element(
-        "rdf:RDF",
-        {
-            "xmlns:rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
-            "xmlns:rdfs": "http://www.w3.org/2000/01/rdf-schema#",
-            "xmlns:owl": "http://www.w3.org/2002/07/owl#",
-            "xmlns:xsd": "http://www.w3.org/2001/XMLSchema#",
-            "xml:base": "http://example.org/course_ontology",
-        },
-    )
+NSMAP = {
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "owl": "http://www.w3.org/2002/07/owl#",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+}
+RDF = "{%s}" % NSMAP["rdf"]
+RDFS = "{%s}" % NSMAP["rdfs"]
+OWL = "{%s}" % NSMAP["owl"]
+XML_BASE = "{http://www.w3.org/XML/1998/namespace}base"
+
+# Output of _build_tbox_dynamic(): the schema is hard-coded, so the TBox is written as this constant.
+# Regenerate it from _build_tbox_dynamic() after changing the schema there
+# (run with --check to verify that the two still match).
+_TBOX_XML = """<?xml version='1.0' encoding='utf-8'?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#" xmlns:owl="http://www.w3.org/2002/07/owl#" xmlns:xsd="http://www.w3.org/2001/XMLSchema#" xml:base="http://example.org/course_ontology">
+  <owl:Ontology rdf:about="http://example.org/course_ontology"/>
+  <owl:Class rdf:about="#Course"/>
+  <owl:Class rdf:about="#Skill"/>
+  <owl:Class rdf:about="#DescriptionText"/>
+  <owl:ObjectProperty rdf:about="#hasSkill">
+    <rdfs:domain rdf:resource="#Course"/>
+    <rdfs:range rdf:resource="#Skill"/>
+  </owl:ObjectProperty>
+  <owl:ObjectProperty rdf:about="#hasDescription">
+    <rdfs:domain rdf:resource="#Course"/>
+    <rdfs:range rdf:resource="#DescriptionText"/>
+  </owl:ObjectProperty>
+  <owl:DatatypeProperty rdf:about="#courseTitle">
+    <rdfs:domain rdf:resource="#Course"/>
+    <rdfs:range rdf:resource="xsd:string"/>
+  </owl:DatatypeProperty>
+  <owl:DatatypeProperty rdf:about="#descriptionText">
+    <rdfs:domain rdf:resource="#DescriptionText"/>
+    <rdfs:range rdf:resource="xsd:string"/>
+  </owl:DatatypeProperty>
+  <owl:DatatypeProperty rdf:about="#originalDescription">
+    <rdfs:domain rdf:resource="#DescriptionText"/>
+    <rdfs:range rdf:resource="xsd:string"/>
+  </owl:DatatypeProperty>
+  <owl:DatatypeProperty rdf:about="#combinedDescription">
+    <rdfs:domain rdf:resource="#DescriptionText"/>
+    <rdfs:range rdf:resource="xsd:string"/>
+  </owl:DatatypeProperty>
+  <owl:DatatypeProperty rdf:about="#skillName">
+    <rdfs:domain rdf:resource="#Skill"/>
+    <rdfs:range rdf:resource="xsd:string"/>
+  </owl:DatatypeProperty>
+</rdf:RDF>
+"""
+
+
+# Builds the TBox ontology for the courses dataset schema
+def _build_tbox_dynamic():
+    # lxml takes {namespace}name tags; nsmap keeps the rdf/rdfs/owl/xsd prefixes in the output
+    rdf = Element(RDF + "RDF", {XML_BASE: "http://example.org/course_ontology"}, nsmap=NSMAP)
 
     # Ontology root
-    SubElement(rdf, "owl:Ontology", {"rdf:about": "http://example.org/course_ontology"})
+    SubElement(rdf, OWL + "Ontology", {RDF + "about": "http://example.org/course_ontology"})
 
     # Classes
     classes = ["Course", "Skill", "DescriptionText"]
     for cls in classes:
-        SubElement(rdf, "owl:Class", {"rdf:about": f"#{cls}"})
+        SubElement(rdf, OWL + "Class", {RDF + "about": f"#{cls}"})
 
     # Object properties
     object_props = {
@@ -30,9 +73,9 @@ def generate_tbox(output_path="tbox.owl"):
         "hasDescription": ("Course", "DescriptionText"),
     }
     for prop, (dom, ran) in object_props.items():
-        p = SubElement(rdf, "owl:ObjectProperty", {"rdf:about": f"#{prop}"})
-        SubElement(p, "rdfs:domain", {"rdf:resource": f"#{dom}"})
-        SubElement(p, "rdfs:range", {"rdf:resource": f"#{ran}"})
+        p = SubElement(rdf, OWL + "ObjectProperty", {RDF + "about": f"#{prop}"})
+        SubElement(p, RDFS + "domain", {RDF + "resource": f"#{dom}"})
+        SubElement(p, RDFS + "range", {RDF + "resource": f"#{ran}"})
 
     # Data properties
     data_props = {
@@ -43,19 +86,37 @@ def generate_tbox(output_path="tbox.owl"):
         "skillName": "Skill",
     }
     for prop, dom in data_props.items():
-        p = SubElement(rdf, "owl:DatatypeProperty", {"rdf:about": f"#{prop}"})
-        SubElement(p, "rdfs:domain", {"rdf:resource": f"#{dom}"})
-        SubElement(p, "rdfs:range", {"rdf:resource": "xsd:string"})
+        p = SubElement(rdf, OWL + "DatatypeProperty", {RDF + "about": f"#{prop}"})
+        SubElement(p, RDFS + "domain", {RDF + "resource": f"#{dom}"})
+        SubElement(p, RDFS + "range", {RDF + "resource": "xsd:string"})
 
-    xml_str = minidom.parseString(tostring(rdf)).toprettyxml(indent="  ")
+    # Indented while serializing, without reparsing into a DOM
+    return tostring(rdf, pretty_print=True, xml_declaration=True, encoding="utf-8").decode("utf-8")
 
-    actual_output_path = os.path.abspath(pathlib.Path(output_path))
+
+def check_tbox():
+    """Raise if _TBOX_XML no longer matches the output of _build_tbox_dynamic()."""
+    if _build_tbox_dynamic() != _TBOX_XML:
+        raise RuntimeError("_TBOX_XML is out of date; regenerate it from _build_tbox_dynamic()")
+
+
+# Writes the TBox ontology for the courses dataset schema
+def generate_tbox(output_path="tbox.owl"):
+    actual_output_path = pathlib.Path(output_path).resolve()
 
     with open(actual_output_path, "w", encoding="utf-8") as f:
-        f.write(xml_str)
+        f.write(_TBOX_XML)
 
     print(f"TBox ontology saved to {actual_output_path}")
 
 
 if __name__ == "__main__":
-    generate_tbox("tbox.owl")
+    parser = argparse.ArgumentParser(description="Write the TBox (schema) OWL file.")
+    parser.add_argument("--check", action="store_true",
+                        help="Verify the precomputed TBox matches the builder, then exit without writing.")
+    args = parser.parse_args()
+    if args.check:
+        check_tbox()
+        print("TBox constant is up to date.")
+    else:
+        generate_tbox("tbox.owl")